@@ -0,0 +1,48 @@
+"""persist job results
+
+Revision ID: 20261019_000002
+Revises: 20251019_000001
+Create Date: 2026-10-19 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261019_000002'
+down_revision = '20251019_000001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('similarity', sa.Float(), nullable=True))
+    op.add_column('jobs', sa.Column('ai_probability', sa.Float(), nullable=True))
+    op.add_column('jobs', sa.Column('summary', sa.JSON(), nullable=True))
+
+    # Fragments are persisted from job results: rank within the result,
+    # fragment text and the labelled source instead of a document position
+    op.alter_column('fragments', 'doc_pos', existing_type=sa.Integer(), nullable=True)
+    op.add_column('fragments', sa.Column('rank', sa.Integer(), nullable=True))
+    op.add_column('fragments', sa.Column('text', sa.Text(), nullable=True))
+    op.add_column('fragments', sa.Column('source_title', sa.String(length=512), nullable=True))
+    op.add_column('fragments', sa.Column('source_url', sa.String(length=1024), nullable=True))
+
+    op.create_index('ix_jobs_document_id', 'jobs', ['document_id'])
+    op.create_index('ix_fragments_job_id', 'fragments', ['job_id'])
+    op.create_index('ix_documents_user_id', 'documents', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_user_id', table_name='documents')
+    op.drop_index('ix_fragments_job_id', table_name='fragments')
+    op.drop_index('ix_jobs_document_id', table_name='jobs')
+
+    op.drop_column('fragments', 'source_url')
+    op.drop_column('fragments', 'source_title')
+    op.drop_column('fragments', 'text')
+    op.drop_column('fragments', 'rank')
+    op.alter_column('fragments', 'doc_pos', existing_type=sa.Integer(), nullable=False)
+
+    op.drop_column('jobs', 'summary')
+    op.drop_column('jobs', 'ai_probability')
+    op.drop_column('jobs', 'similarity')
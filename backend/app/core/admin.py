@@ -0,0 +1,25 @@
+"""
+Admin authorization for operator-only features (e.g. job profiling).
+Admins send `Authorization: Bearer <ADMIN_TOKEN>`; with no ADMIN_TOKEN
+configured nobody is an admin.
+"""
+import hmac
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+
+def is_admin(authorization: Optional[str]) -> bool:
+    if not settings.admin_token or not authorization:
+        return False
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer":
+        return False
+    return hmac.compare_digest(token.strip(), settings.admin_token)
+
+
+def require_admin(authorization: Optional[str]):
+    if not is_admin(authorization):
+        raise HTTPException(status_code=403, detail="Admin token required")
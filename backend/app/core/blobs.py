@@ -0,0 +1,97 @@
+"""
+API side of the claim-check blob store (worker/worker/blobs.py).
+Pasted texts above settings.blob_threshold_bytes are written to the blob
+store and sent to the worker as a reference; results the worker stored the
+same way are resolved when served.
+
+References are URLs: file:///<dir>/<key> (local store) or s3://<bucket>/<key>.
+A result replaced by a reference looks like {"result_ref": "<url>", "size": <bytes>}.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from app.config import settings
+
+RESULT_REF = "result_ref"
+
+_s3 = None
+
+
+def enabled() -> bool:
+    return settings.blob_store in ("local", "s3")
+
+
+def _s3_client():
+    global _s3
+    if _s3 is None:
+        import boto3
+        _s3 = boto3.client(
+            "s3",
+            endpoint_url=settings.s3_endpoint,
+            aws_access_key_id=settings.s3_access_key,
+            aws_secret_access_key=settings.s3_secret_key,
+            region_name=settings.s3_region,
+            use_ssl=settings.s3_use_ssl,
+        )
+    return _s3
+
+
+def put(key: str, data: bytes) -> str:
+    """Store `data` under `key`; returns its reference."""
+    if settings.blob_store == "s3":
+        _s3_client().put_object(Bucket=settings.s3_bucket, Key=key, Body=data)
+        return f"s3://{settings.s3_bucket}/{key}"
+    path = Path(settings.blob_dir) / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Readers never see a partly written blob
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return path.as_uri()
+
+
+def get(ref: str) -> bytes:
+    url = urlparse(ref)
+    if url.scheme == "s3":
+        return _s3_client().get_object(Bucket=url.netloc, Key=url.path.lstrip("/"))["Body"].read()
+    if url.scheme == "file":
+        return Path(url2pathname(url.path)).read_bytes()
+    raise ValueError(f"Unsupported blob reference: {ref}")
+
+
+def offload_text(text: str, content_sha256: str) -> Optional[str]:
+    """
+    Blob reference for a pasted text too large to send inline (None = inline).
+    Keyed by content hash, so identical texts share one blob.
+    """
+    data = text.encode("utf-8")
+    if not enabled() or len(data) <= settings.blob_threshold_bytes:
+        return None
+    try:
+        return put(f"texts/{content_sha256}.txt", data)
+    except Exception as e:
+        # Inline is slower but still correct
+        print(f"Warning: text offload failed: {e}")
+        return None
+
+
+def is_ref(result: Any) -> bool:
+    return isinstance(result, dict) and set(result) == {RESULT_REF, "size"}
+
+
+def resolve_result(result: Any) -> Any:
+    """
+    Result as stored by the worker, with a blob reference replaced by its
+    content (None when the blob is gone).
+    """
+    if not is_ref(result):
+        return result
+    try:
+        return json.loads(get(result[RESULT_REF]))
+    except Exception as e:
+        print(f"Warning: result blob unavailable: {e}")
+        return None
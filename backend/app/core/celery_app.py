@@ -1,5 +1,6 @@
 from celery import Celery
 from app.config import settings
+from app.core.scheduling import BROKER_TRANSPORT_OPTIONS
 
 celery_app = Celery(
     "plagiarism_checker",
@@ -14,4 +15,6 @@ celery_app.conf.update(
     accept_content=["json"],
     timezone="UTC",
     enable_utc=True,
+    # Per-priority Redis lists; must match the worker (see scheduling.py)
+    broker_transport_options=BROKER_TRANSPORT_OPTIONS,
 )
@@ -0,0 +1,26 @@
+"""
+Strong ETags for JSON responses of polling endpoints.
+Clients send the last ETag in If-None-Match; an unchanged body is answered
+with 304 Not Modified and no payload.
+"""
+import json
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+def json_response(body: Any, if_none_match: Optional[str] = None) -> Response:
+    """JSON response with an ETag over its serialized body (304 when it matches)."""
+    content = json.dumps(body, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    # Revalidate on every poll instead of reusing a stale copy
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -0,0 +1,167 @@
+"""
+Push delivery of job progress and completion to API clients.
+
+Workers publish every stage progress write and every job completion as JSON
+on one Redis pub/sub channel (worker/worker/progress.py). Each API process
+holds a single subscription to that channel and fans events out to the SSE /
+WebSocket clients watching the job, so connected clients cost no Redis
+traffic of their own besides one status snapshot when they connect.
+"""
+import asyncio
+import json
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core import job_status
+
+# Events buffered per client; a slow client loses its oldest events first
+QUEUE_SIZE = 256
+# Seconds between reconnect attempts after the subscription is lost
+RECONNECT_DELAY = 1.0
+
+# Jobs that are finished when created and never publish events (development
+# fallback ids, result cache hits)
+STATIC_PREFIXES = ("dev_", "cache_")
+# Pseudo-event asking watchers to re-read job states (events may have been missed)
+RESYNC = {"event": "resync"}
+
+
+class EventHub:
+    """Single pub/sub subscription per process, fanned out to per-client queues."""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._watchers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    @asynccontextmanager
+    async def watch(self, job_ids: List[str]) -> AsyncIterator[asyncio.Queue]:
+        """Queue receiving the events of `job_ids` while the context is open."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        for job_id in job_ids:
+            self._watchers[job_id].add(queue)
+        live = any(not job_id.startswith(STATIC_PREFIXES) for job_id in job_ids)
+        if live and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+        try:
+            # Callers read job states after this; events published from then on
+            # must reach the queue (if Redis is down, the resync after
+            # reconnecting covers it). Static jobs have nothing to wait for.
+            if live:
+                try:
+                    await asyncio.wait_for(self._subscribed.wait(), settings.events_keepalive)
+                except asyncio.TimeoutError:
+                    pass
+            yield queue
+        finally:
+            for job_id in job_ids:
+                watchers = self._watchers.get(job_id)
+                if watchers is not None:
+                    watchers.discard(queue)
+                    if not watchers:
+                        del self._watchers[job_id]
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self):
+        reconnect = False
+        while True:
+            client = aioredis.from_url(settings.redis_url, decode_responses=True)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self._subscribed.set()
+                if reconnect:
+                    self._broadcast(RESYNC)
+                async for message in pubsub.listen():
+                    self._dispatch(message["data"])
+            except (redis.RedisError, OSError) as e:
+                print(f"Warning: job event subscription lost: {e}")
+            finally:
+                self._subscribed.clear()
+                await pubsub.aclose()
+                await client.aclose()
+            reconnect = True
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _dispatch(self, data: str):
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        for queue in list(self._watchers.get(event.get("job_id"), ())):
+            _offer(queue, event)
+
+    def _broadcast(self, event: Dict):
+        for queue in {queue for watchers in self._watchers.values() for queue in watchers}:
+            _offer(queue, event)
+
+
+def _offer(queue: asyncio.Queue, event: Dict):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+hub = EventHub(settings.events_channel)
+
+
+async def job_events(job_ids: List[str]) -> AsyncIterator[Optional[Dict]]:
+    """
+    Current status of each job, then its events until every job is done.
+
+    Yields:
+        {"event": "status", **job_status entry} per job on connect (and again
+        after a lost subscription), {"job_id", "event": "progress" | "done", ...}
+        as published by the workers, None after settings.events_keepalive
+        seconds without events
+    """
+    async with hub.watch(job_ids) as queue:
+        pending = set(job_ids)
+        event = RESYNC
+        while pending:
+            if event is RESYNC:
+                # Subscribed before reading (see watch), so nothing falls in between
+                try:
+                    entries = await run_in_threadpool(
+                        job_status.fetch, [job_id for job_id in job_ids if job_id in pending]
+                    )
+                except redis.RedisError:
+                    yield {"event": "error", "detail": "Result backend unavailable"}
+                    return
+                for entry in entries:
+                    yield {"event": "status", **entry}
+                    if entry["ready"] or entry["status"] == "NOT_FOUND":
+                        pending.discard(entry["job_id"])
+            elif event.get("job_id") in pending:
+                yield event
+                if event["event"] == "done":
+                    pending.discard(event["job_id"])
+            if not pending:
+                return
+            try:
+                event = await asyncio.wait_for(queue.get(), settings.events_keepalive)
+            except asyncio.TimeoutError:
+                event = {}
+                yield None
+
+
+def sse_message(event: Optional[Dict]) -> str:
+    """Server-Sent Events frame of a job event (comment line for keepalives)."""
+    if event is None:
+        return ": keepalive\n\n"
+    return f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
@@ -0,0 +1,142 @@
+"""
+Bulk lookup of job states and results.
+Resolves any number of job ids with one pipelined round trip to Redis
+(Celery result metadata, cache-hit job records and progress hashes or
+partial fragments) plus, when cache-hit jobs are among them, one MGET of
+their cached results. Jobs Redis no longer knows are looked up in
+PostgreSQL (app.core.results_db) with one query.
+"""
+import json
+from typing import Dict, List, Optional
+
+from celery import states
+
+from app.config import settings
+from app.core.celery_app import celery_app
+from app.core import result_cache, progress, blobs, results_db
+from app.core.result_cache import get_redis
+
+
+def parse_ids(ids: str) -> List[str]:
+    """
+    Job ids of a bulk request (comma-separated, duplicates dropped).
+
+    Raises:
+        ValueError: No ids, or more than settings.bulk_max_jobs
+    """
+    job_ids = list(dict.fromkeys(job_id.strip() for job_id in ids.split(",") if job_id.strip()))
+    if not job_ids:
+        raise ValueError("Provide at least one job id")
+    if len(job_ids) > settings.bulk_max_jobs:
+        raise ValueError(f"At most {settings.bulk_max_jobs} job ids per request")
+    return job_ids
+
+
+def _meta_key(job_id: str) -> str:
+    key = celery_app.backend.get_key_for_task(job_id)
+    return key.decode() if isinstance(key, bytes) else key
+
+
+def _task_entry(job_id: str, meta: Optional[str], with_results: bool) -> Dict:
+    # No metadata yet: queued (Celery reports unknown ids as PENDING too)
+    if meta is None:
+        entry = {"job_id": job_id, "status": states.PENDING, "ready": False}
+        return {**entry, "result": None} if with_results else entry
+
+    meta = json.loads(meta)
+    status = meta["status"]
+    entry = {"job_id": job_id, "status": status, "ready": status in states.READY_STATES}
+    if status == states.FAILURE:
+        failure = meta.get("result") or {}
+        entry["error"] = str(failure.get("exc_message", failure)) if isinstance(failure, dict) else str(failure)
+    if with_results:
+        # Large results are read from the blob store
+        entry["result"] = blobs.resolve_result(meta.get("result")) if status == states.SUCCESS else None
+    return entry
+
+
+def fetch(job_ids: List[str], with_results: bool = False) -> List[Dict]:
+    """
+    Status (and optionally result) of many jobs.
+
+    Args:
+        job_ids: Celery task ids, cache_ and dev_ job ids
+        with_results: Include each finished job's result
+
+    Returns:
+        One {"job_id", "status", "ready"} entry per id, in order, plus
+        "progress" for running jobs (status only), or "result" and "complete"
+        (with_results; running jobs also list the "fragments" found so far)
+
+    Raises:
+        redis.RedisError: Redis unavailable
+    """
+    task_ids = [job_id for job_id in job_ids if not job_id.startswith(("dev_", "cache_"))]
+    cache_ids = [job_id for job_id in job_ids if job_id.startswith("cache_")]
+    r = get_redis()
+
+    # Round trip 1: task metadata, cache-hit records, progress of running tasks
+    pipe = r.pipeline(transaction=False)
+    if task_ids:
+        pipe.mget([_meta_key(job_id) for job_id in task_ids])
+    if cache_ids:
+        pipe.mget([result_cache.job_key(job_id) for job_id in cache_ids])
+    for job_id in task_ids:
+        if with_results:
+            pipe.lrange(progress.fragments_key(job_id), 0, -1)
+        else:
+            pipe.hgetall(progress.progress_key(job_id))
+    replies = pipe.execute()
+
+    metas = replies.pop(0) if task_ids else []
+    records = replies.pop(0) if cache_ids else []
+    entries = {}
+    for index, (job_id, meta) in enumerate(zip(task_ids, metas)):
+        entry = _task_entry(job_id, meta, with_results)
+        if with_results:
+            entry["complete"] = entry["ready"]
+            if not entry["ready"]:
+                entry["fragments"] = progress.parse_fragments(replies[index])
+        elif not entry["ready"]:
+            job_progress = progress.parse_progress(replies[index])
+            if job_progress is not None:
+                entry["progress"] = job_progress
+        entries[job_id] = entry
+
+    # Round trip 2: the cached results cache-hit jobs point to (existence only
+    # for status lookups)
+    records = [json.loads(record) if record else None for record in records]
+    result_keys = [record["result_key"] for record in records if record]
+    if not result_keys:
+        found = []
+    elif with_results:
+        found = r.mget(result_keys)
+    else:
+        pipe = r.pipeline(transaction=False)
+        for key in result_keys:
+            pipe.exists(key)
+        found = pipe.execute()
+    found = iter(found)
+    for job_id, record in zip(cache_ids, records):
+        value = next(found) if record else None
+        if not value:
+            entries[job_id] = {"job_id": job_id, "status": "NOT_FOUND", "ready": False}
+            if with_results:
+                entries[job_id].update({"result": None, "complete": False})
+            continue
+        entries[job_id] = {"job_id": job_id, "status": states.SUCCESS, "ready": True}
+        if with_results:
+            entries[job_id].update({"result": result_cache.job_result(record, value), "complete": True})
+
+    # Tasks unknown to the result backend may have finished before it expired
+    # (or Redis restarted): one query for their persisted results
+    unknown = [job_id for job_id, meta in zip(task_ids, metas) if meta is None]
+    for job_id, result in results_db.get_results(unknown).items():
+        entries[job_id] = {"job_id": job_id, "status": states.SUCCESS, "ready": True}
+        if with_results:
+            entries[job_id].update({"result": result, "complete": True})
+
+    for job_id in job_ids:
+        if job_id.startswith("dev_"):
+            entries[job_id] = {"job_id": job_id, "status": states.SUCCESS, "ready": True}
+    return [entries[job_id] for job_id in job_ids]
@@ -0,0 +1,89 @@
+"""
+Prometheus metrics for the API.
+Per-route request latency, upload sizes, result-cache lookups at upload time
+and Celery queue depth (read from Redis on every scrape).
+
+With several uvicorn workers set PROMETHEUS_MULTIPROC_DIR so /metrics
+aggregates all processes.
+"""
+import os
+from typing import List
+
+import redis
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from app.config import settings
+from app.core.result_cache import get_redis
+from app.core.scheduling import PRIORITY_STEPS, priority_keys
+
+REQUEST_SECONDS = Histogram(
+    "plagiarism_http_request_seconds",
+    "API request latency",
+    ["method", "route", "status"],
+)
+UPLOAD_BYTES = Histogram(
+    "plagiarism_upload_bytes",
+    "Size of uploaded documents and pasted text",
+    ["kind"],
+    buckets=(1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7),
+)
+CACHE_REQUESTS = Counter(
+    "plagiarism_cache_requests_total",
+    "Cache lookups by outcome (hit ratio = hit / (hit + miss))",
+    ["cache", "outcome"],
+)
+
+
+class QueueDepthCollector:
+    """
+    Reports the length of each Celery queue in Redis at scrape time
+    (summed over the queue's per-priority lists).
+    """
+
+    def __init__(self, queues: List[str]):
+        self.queues = queues
+
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "plagiarism_queue_depth",
+            "Tasks waiting in a Celery queue",
+            labels=["queue"],
+        )
+        try:
+            pipe = get_redis().pipeline()
+            for queue in self.queues:
+                for key in priority_keys(queue):
+                    pipe.llen(key)
+            lengths = pipe.execute()
+            steps = len(PRIORITY_STEPS)
+            for index, queue in enumerate(self.queues):
+                depth.add_metric([queue], sum(lengths[index * steps:(index + 1) * steps]))
+        except redis.RedisError:
+            pass
+        yield depth
+
+
+def _build_registry() -> CollectorRegistry:
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    registry.register(QueueDepthCollector(settings.metrics_queues))
+    return registry
+
+
+registry = _build_registry()
+
+
+def render() -> bytes:
+    return generate_latest(registry)
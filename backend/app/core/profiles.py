@@ -0,0 +1,19 @@
+"""
+Read side of per-job profiling reports (worker/worker/profiling.py).
+"""
+import json
+from typing import Dict, Optional
+
+import redis
+
+from app.config import settings
+from app.core.result_cache import get_redis
+
+
+def get_profile(job_id: str) -> Optional[Dict]:
+    """Stored cProfile report of a job, or None if it was not profiled or expired."""
+    try:
+        report = get_redis().get(f"{settings.profile_prefix}:{job_id}")
+    except redis.RedisError:
+        return None
+    return json.loads(report) if report else None
@@ -0,0 +1,82 @@
+"""
+Read side of the worker's per-job stage progress and partial fragments
+(worker/worker/progress.py).
+"""
+import json
+from typing import Dict, List, Optional
+
+import redis
+
+from app.config import settings
+from app.core.result_cache import get_redis
+
+STAGES = ("extract", "normalize", "similarity", "ai", "fragments")
+# Partial fragments returned, best first (as many as a finished result keeps)
+PARTIAL_FRAGMENTS = 10
+
+
+def get_progress(job_id: str) -> Optional[Dict]:
+    """
+    Per-stage status, work done and elapsed time of a job.
+
+    Returns:
+        {"stage", "percent", "stages"} or None when nothing was reported yet
+    """
+    try:
+        fields = get_redis().hgetall(progress_key(job_id))
+    except redis.RedisError:
+        return None
+    return parse_progress(fields)
+
+
+def get_partial_fragments(job_id: str) -> List[Dict]:
+    """Best matching fragments a running job has found so far."""
+    try:
+        batches = get_redis().lrange(fragments_key(job_id), 0, -1)
+    except redis.RedisError:
+        return []
+    return parse_fragments(batches)
+
+
+def progress_key(job_id: str) -> str:
+    return f"{settings.progress_prefix}:{job_id}"
+
+
+def fragments_key(job_id: str) -> str:
+    return f"{progress_key(job_id)}:fragments"
+
+
+def parse_fragments(batches: List[str]) -> List[Dict]:
+    """Merge the fragment batches pushed by the worker (see get_partial_fragments)."""
+    fragments = [fragment for batch in batches for fragment in json.loads(batch)]
+    fragments.sort(key=lambda fragment: fragment["score"], reverse=True)
+    return fragments[:PARTIAL_FRAGMENTS]
+
+
+def parse_progress(fields: Dict[str, str]) -> Optional[Dict]:
+    """Summarize a job's progress hash (see get_progress)."""
+    if not fields:
+        return None
+
+    stages = {}
+    completed = 0.0
+    for stage in STAGES:
+        status = fields.get(f"{stage}:status")
+        if status is None:
+            continue
+        done = int(fields.get(f"{stage}:done", 0))
+        total = max(1, int(fields.get(f"{stage}:total", 1)))
+        stages[stage] = {
+            "status": status,
+            "done": done,
+            "total": total,
+            "elapsed_ms": int(fields.get(f"{stage}:ms", 0)),
+        }
+        completed += min(done, total) / total
+
+    running = [stage for stage, info in stages.items() if info["status"] == "running"]
+    return {
+        "stage": ",".join(running) or None,
+        "percent": round(100 * completed / len(STAGES), 1),
+        "stages": stages,
+    }
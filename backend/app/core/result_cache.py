@@ -0,0 +1,104 @@
+"""
+Read side of the worker's content-hash result cache (worker/worker/cache.py).
+Lets the upload route answer identical resubmissions without enqueueing.
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+from app.config import settings
+
+# Result fields that describe the job rather than the text (worker/worker/cache.py);
+# cached results of older workers may still carry them
+JOB_FIELDS = ("doc_id", "title", "incremental", "budget")
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url, decode_responses=True, socket_timeout=2)
+    return _client
+
+
+def _key(*parts: str) -> str:
+    return ":".join((settings.result_cache_prefix,) + parts)
+
+
+def lookup(content_sha256: str) -> Optional[str]:
+    """Return the cached result key for a raw upload hash, if any."""
+    return lookup_many([content_sha256])[0]
+
+
+def lookup_many(content_sha256s: List[str]) -> List[Optional[str]]:
+    """
+    Cached result keys for many raw upload hashes (None where not cached),
+    in three round trips however many hashes are given.
+    """
+    keys: List[Optional[str]] = [None] * len(content_sha256s)
+    if not content_sha256s:
+        return keys
+    try:
+        r = get_redis()
+        fingerprint = r.get(_key("fingerprint"))
+        if not fingerprint:
+            return keys
+        result_keys = r.mget([_key("raw", fingerprint, sha) for sha in content_sha256s])
+        pipe = r.pipeline(transaction=False)
+        for result_key in result_keys:
+            if result_key:
+                pipe.exists(result_key)
+        exists = iter(pipe.execute())
+        for index, result_key in enumerate(result_keys):
+            if result_key and next(exists):
+                keys[index] = result_key
+    except redis.RedisError:
+        pass
+    return keys
+
+
+def register_job(job_id: str, result_key: str, doc_id: str, title: Optional[str]):
+    """Remember which cached result a cache-hit job id points to."""
+    register_jobs([(job_id, result_key, doc_id, title)])
+
+
+def register_jobs(jobs: List[Tuple[str, str, str, Optional[str]]]):
+    """register_job for many (job_id, result_key, doc_id, title) in one round trip."""
+    pipe = get_redis().pipeline(transaction=False)
+    for job_id, result_key, doc_id, title in jobs:
+        record = {"result_key": result_key, "doc_id": doc_id, "title": title}
+        pipe.setex(_key("job", job_id), settings.result_cache_ttl, json.dumps(record))
+    pipe.execute()
+
+
+def get_job_result(job_id: str) -> Optional[Dict]:
+    """Resolve a cache-hit job id to its result, or None if it expired."""
+    try:
+        r = get_redis()
+        record = r.get(job_key(job_id))
+        if not record:
+            return None
+        record = json.loads(record)
+        cached = r.get(record["result_key"])
+    except redis.RedisError:
+        return None
+    return job_result(record, cached)
+
+
+def job_key(job_id: str) -> str:
+    return _key("job", job_id)
+
+
+def job_result(record: Dict, cached: Optional[str]) -> Optional[Dict]:
+    """Cached result JSON of a cache-hit job with the job's own doc id and title."""
+    if not cached:
+        return None
+    result = {key: value for key, value in json.loads(cached).items() if key not in JOB_FIELDS}
+    result.update({
+        "doc_id": record["doc_id"],
+        "title": record["title"] or "Untitled Document",
+        "cache_hit": True,
+    })
+    return result
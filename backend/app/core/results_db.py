@@ -0,0 +1,64 @@
+"""
+Read side of the results the worker persists in PostgreSQL (worker/worker/store.py).
+A job's summary row and its fragments come back in one query, for any number
+of jobs, so served results survive the Redis result backend's expiry.
+"""
+from typing import Dict, List
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.db import engine
+
+_RESULTS = text(
+    """
+    SELECT j.id, j.summary,
+           COALESCE((
+               SELECT json_agg(json_build_object(
+                   'text', f.text,
+                   'score', f.score,
+                   'source', f.source_title,
+                   'url', f.source_url,
+                   'matched_text', f.source_excerpt
+               ) ORDER BY f.rank)
+               FROM fragments f
+               WHERE f.job_id = j.id
+           ), '[]') AS fragments
+    FROM jobs j
+    WHERE j.id IN :job_ids AND j.summary IS NOT NULL
+    """
+).bindparams(bindparam("job_ids", expanding=True))
+
+
+def get_results(job_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Persisted results of finished jobs.
+
+    Returns:
+        {job_id: result} for the jobs found; empty when persistence is off or
+        the database is unavailable
+    """
+    if not settings.persist_results or not job_ids:
+        return {}
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(_RESULTS, {"job_ids": list(job_ids)}).all()
+    except SQLAlchemyError as e:
+        print(f"Warning: result database unavailable: {e}")
+        return {}
+    return {
+        row.id: {
+            **row.summary,
+            # Fragments without a mapped source have no url
+            "fragments": [
+                {key: value for key, value in fragment.items() if value is not None}
+                for fragment in row.fragments
+            ],
+        }
+        for row in rows
+    }
+
+
+def get_result(job_id: str):
+    return get_results([job_id]).get(job_id)
@@ -0,0 +1,75 @@
+"""
+Job classes, queues and deadline-based priorities for uploads.
+
+Every upload is classified by size (interactive / standard / bulk), sent to
+its class queue and given a deadline (now + the class's target latency).
+The deadline is mapped to a broker priority: the Redis transport keeps one
+list per priority step and a worker pops step 0 of all its queues before
+step 1 of any queue, so earliest-deadline work runs first across queues.
+
+The broker transport options must match on the API and the worker.
+"""
+import time
+from bisect import bisect_left
+from typing import Dict, Optional
+
+from app.config import settings
+
+# Redis priorities: 0 is popped first
+PRIORITY_STEPS = list(range(10))
+# Upper bound (seconds until the deadline) of priority steps 0..8; 9 = beyond
+_SLACK_BOUNDS = (1, 5, 15, 60, 300, 900, 3600, 4 * 3600, 24 * 3600)
+
+BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": PRIORITY_STEPS,
+    # Equal priority: queues in -Q order (interactive first)
+    "queue_order_strategy": "priority",
+}
+# Key separator of the per-priority Redis lists (kombu default)
+PRIORITY_SEP = "\x06\x16"
+
+JOB_CLASSES = ("interactive", "standard", "bulk")
+
+
+def job_class(size: int) -> str:
+    """Class of a job from the size of its text (characters) or file (bytes)."""
+    if size <= settings.job_interactive_max_size:
+        return "interactive"
+    if size <= settings.job_standard_max_size:
+        return "standard"
+    return "bulk"
+
+
+def priority_for_deadline(deadline: float, now: Optional[float] = None) -> int:
+    """Broker priority step for the time left until `deadline` (epoch seconds)."""
+    slack = deadline - (time.time() if now is None else now)
+    return bisect_left(_SLACK_BOUNDS, slack)
+
+
+def priority_keys(queue: str):
+    """Redis list keys holding the messages of `queue`, one per priority step."""
+    return [queue if step == 0 else f"{queue}{PRIORITY_SEP}{step}" for step in PRIORITY_STEPS]
+
+
+def plan(size: int, cls: Optional[str] = None) -> Dict:
+    """
+    Scheduling fields of a new job.
+
+    Args:
+        size: Upload size (see job_class)
+        cls: Job class to use instead of the size-based one
+
+    Returns:
+        {"job_class", "queue", "deadline", "priority", "enqueued_at", "budget_ms"}
+    """
+    cls = cls or job_class(size)
+    now = time.time()
+    deadline = now + settings.job_deadlines[cls]
+    return {
+        "job_class": cls,
+        "queue": settings.job_queues[cls],
+        "deadline": deadline,
+        "priority": priority_for_deadline(deadline, now),
+        "enqueued_at": now,
+        "budget_ms": settings.job_budgets_ms[cls] or None,
+    }
@@ -0,0 +1,52 @@
+"""
+OpenTelemetry tracing for the API.
+Spans are exported to the console or appended as JSON lines to a local file
+(see worker/worker/tracing.py for the worker side of the same trace).
+Without opentelemetry-sdk, or with OTEL_TRACES_EXPORTER=none, spans are no-ops.
+"""
+import time
+from typing import Dict
+
+from opentelemetry import propagate, trace
+
+from app.config import settings
+
+tracer = trace.get_tracer("app")
+
+_configured = False
+
+
+def configure():
+    """Install a tracer provider with a console or file exporter (once)."""
+    global _configured
+    exporter_name = settings.otel_traces_exporter.lower()
+    if _configured or exporter_name in ("", "none"):
+        return
+    _configured = True
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        print("Warning: opentelemetry-sdk not installed, tracing disabled")
+        return
+
+    if exporter_name == "file":
+        exporter = ConsoleSpanExporter(
+            out=open(settings.otel_traces_file, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    else:
+        exporter = ConsoleSpanExporter()
+
+    provider = TracerProvider(resource=Resource.create({"service.name": "plagiarism-api"}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+
+def inject() -> Dict:
+    """Trace context for a task payload, stamped with the hand-off time."""
+    carrier = {"sent_at": time.time()}
+    propagate.inject(carrier)
+    return carrier
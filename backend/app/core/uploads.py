@@ -0,0 +1,254 @@
+"""
+Streaming reception of upload forms.
+The request body is fed to an incremental multipart parser as it arrives:
+file parts are written straight to their destination and hashed on the way,
+so an upload is never spooled or held in memory, and the size limits are
+enforced on the bytes received (chunked bodies included), not after the fact.
+Parsing and file I/O run in the thread pool so other requests keep being
+served meanwhile.
+"""
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from app.config import settings
+
+# Allowance for the multipart framing and form fields around the files
+FORM_OVERHEAD = 64 * 1024
+
+
+def too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds the limit of {settings.upload_max_bytes} bytes"
+    )
+
+
+def body_limit(max_files: int = 1) -> int:
+    """Largest request body that can hold `max_files` uploads."""
+    return settings.upload_max_bytes * max_files + FORM_OVERHEAD
+
+
+def check_content_length(request: Request, max_files: int = 1) -> Optional[int]:
+    """
+    Reject a request whose declared body size cannot fit `max_files` uploads,
+    before any of the body is read.
+
+    Returns:
+        Declared Content-Length, or None when the body is chunked
+
+    Raises:
+        HTTPException: 413 when the body is too large
+    """
+    length = request.headers.get("content-length")
+    if length is None or not length.isdigit():
+        return None
+    if int(length) > body_limit(max_files):
+        raise too_large()
+    return int(length)
+
+
+class SavedFile:
+    """File part of a form, already written to disk."""
+
+    def __init__(self, field: str, filename: str, path: Path, size: int, sha256: str):
+        self.field = field
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+
+class UploadForm:
+    """Text fields and saved files of a received form."""
+
+    def __init__(self):
+        self.fields: Dict[str, List[str]] = {}
+        self.files: List[SavedFile] = []
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.fields.get(name)
+        return values[0] if values else default
+
+    def getlist(self, name: str) -> List[str]:
+        return self.fields.get(name, [])
+
+    def discard(self):
+        """Remove the saved files (request rejected after parsing)."""
+        for saved in self.files:
+            saved.path.unlink(missing_ok=True)
+
+
+class _MultipartForm:
+    """Incremental multipart/form-data parser writing file parts to disk."""
+
+    def __init__(self, boundary: bytes, dest: Callable[[str], Path], max_files: int):
+        self.form = UploadForm()
+        self.dest = dest
+        self.max_files = max_files
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name = ""
+        self._filename: Optional[str] = None
+        self._file = None
+        self._path: Optional[Path] = None
+        self._digest = None
+        self._size = 0
+        self._data = bytearray()
+        self.parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._filename = None
+        self._path = None
+        self._size = 0
+        self._data = bytearray()
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("utf-8")
+        filename = options.get(b"filename")
+        # An empty file input is sent as a part without a filename
+        if not filename:
+            return
+        if len(self.form.files) >= self.max_files:
+            raise HTTPException(status_code=413, detail=f"At most {self.max_files} files per request")
+        self._filename = filename.decode("utf-8")
+        self._path = self.dest(self._filename)
+        self._file = self._path.open("wb")
+        self._digest = hashlib.sha256()
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        self._size += end - start
+        if self._size > settings.upload_max_bytes:
+            raise too_large()
+        if self._file is not None:
+            self._digest.update(data[start:end])
+            self._file.write(data[start:end])
+        elif self._filename is None:
+            self._data += data[start:end]
+
+    def _on_part_end(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.form.files.append(
+                SavedFile(self._name, self._filename, self._path, self._size, self._digest.hexdigest())
+            )
+        elif self._filename is None:
+            self.form.fields.setdefault(self._name, []).append(self._data.decode("utf-8"))
+
+    def write(self, chunk: bytes):
+        self.parser.write(chunk)
+
+    def finish(self):
+        self.parser.finalize()
+        if self._file is not None:
+            raise ValueError("body ended inside a file part")
+
+    def discard(self):
+        if self._file is not None:
+            self._file.close()
+            self._path.unlink(missing_ok=True)
+        self.form.discard()
+
+
+class _UrlencodedForm:
+    """application/x-www-form-urlencoded body (text fields only)."""
+
+    def __init__(self):
+        self.form = UploadForm()
+        self._body = bytearray()
+
+    def write(self, chunk: bytes):
+        self._body += chunk
+
+    def finish(self):
+        for name, values in parse_qs(self._body.decode("latin-1"), keep_blank_values=True).items():
+            if any(len(value.encode("utf-8")) > settings.upload_max_bytes for value in values):
+                raise too_large()
+            self.form.fields[name] = values
+
+    def discard(self):
+        pass
+
+
+async def receive_form(request: Request, dest: Callable[[str], Path], max_files: int = 1) -> UploadForm:
+    """
+    Read an upload form from the request body as it arrives.
+
+    Args:
+        request: Request whose body has not been read yet
+        dest: Called with each file part's filename; returns the path to write it to
+        max_files: Most file parts accepted
+
+    Returns:
+        The form's text fields and saved files (with size and sha256)
+
+    Raises:
+        HTTPException: 413 once the body, a file or a text field exceeds its
+            limit (files saved so far are removed); 400 for a malformed form;
+            415 for a body that is not a form
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type == b"multipart/form-data":
+        if not options.get(b"boundary"):
+            raise HTTPException(status_code=400, detail="Missing multipart boundary")
+        parser = _MultipartForm(options[b"boundary"], dest, max_files)
+    elif content_type == b"application/x-www-form-urlencoded":
+        parser = _UrlencodedForm()
+    else:
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+    limit = body_limit(max_files)
+    received = 0
+    try:
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            received += len(chunk)
+            if received > limit:
+                raise too_large()
+            await run_in_threadpool(parser.write, chunk)
+        await run_in_threadpool(parser.finish)
+    except HTTPException:
+        await run_in_threadpool(parser.discard)
+        raise
+    except (ValueError, UnicodeDecodeError) as e:
+        # python-multipart reports malformed bodies as ValueError subclasses
+        await run_in_threadpool(parser.discard)
+        raise HTTPException(status_code=400, detail=f"Malformed form: {e}")
+    except BaseException:
+        # Client disconnect or cancellation: leave no partial files behind
+        await run_in_threadpool(parser.discard)
+        raise
+    return parser.form
@@ -1,10 +1,17 @@
-from fastapi import FastAPI, Response
+import time
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from app.routes import upload, jobs, results, auth
+from app.config import settings
+from app.core import metrics, tracing, events, uploads
+from app.routes import upload, jobs, results, auth, cohort, batch, events as event_routes
 
 app = FastAPI(title="Plagiarism Checker API", version="0.1.0")
 
+tracing.configure()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -13,10 +20,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Route template (e.g. /jobs/{job_id}) keeps label cardinality bounded
+        route = request.scope.get("route")
+        metrics.REQUEST_SECONDS.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status),
+        ).observe(time.perf_counter() - start)
+
+
+# Files an upload route accepts per request; bodies that cannot fit are
+# rejected from Content-Length before the multipart body is read
+UPLOAD_ROUTES = {"/api/v1/upload": 1, "/api/v1/batch": settings.batch_max_documents}
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    max_files = UPLOAD_ROUTES.get(request.url.path)
+    if max_files is not None and request.method == "POST":
+        try:
+            uploads.check_content_length(request, max_files)
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+    return await call_next(request)
+
+
 app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
 app.include_router(upload.router, prefix="/api/v1", tags=["upload"])
+app.include_router(batch.router, prefix="/api/v1", tags=["upload"])
 app.include_router(jobs.router, prefix="/api/v1", tags=["jobs"])
 app.include_router(results.router, prefix="/api/v1", tags=["results"])
+app.include_router(event_routes.router, prefix="/api/v1", tags=["jobs"])
+app.include_router(cohort.router, prefix="/api/v1", tags=["cohort"])
 
 
 @app.get("/", tags=["info"])
@@ -27,19 +73,33 @@ async def root():
         "endpoints": {
             "health": "/health",
             "upload": "POST /api/v1/upload",
+            "batch": "POST /api/v1/batch",
             "jobs": "GET /api/v1/jobs/{job_id}",
             "results": "GET /api/v1/results/{job_id}",
+            "events": "GET /api/v1/events?ids=... (SSE), /api/v1/ws/jobs?ids=... (WebSocket)",
+            "cohort": "POST /api/v1/cohort",
+            "metrics": "/metrics",
             "auth": "/api/v1/auth/login, /api/v1/auth/register"
         },
         "frontend": "http://localhost:3000"
     }
 
 
+@app.on_event("shutdown")
+async def close_event_subscription():
+    await events.hub.close()
+
+
 @app.get("/health", tags=["health"])
 async def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
+
+
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     return Response(status_code=204)
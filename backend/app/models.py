@@ -21,7 +21,7 @@ class Document(Base):
     __tablename__ = "documents"
 
     id = Column(String(36), primary_key=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=True)
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=True, index=True)
     title = Column(String(512), nullable=True)
     storage_path = Column(String(1024), nullable=False)
     language = Column(String(32), nullable=True)
@@ -36,11 +36,14 @@ class Job(Base):
     __tablename__ = "jobs"
 
     id = Column(String(64), primary_key=True)  # celery task id
-    document_id = Column(String(36), ForeignKey("documents.id"), nullable=False)
-    status = Column(String(32), default="pending", nullable=False)
+    document_id = Column(String(36), ForeignKey("documents.id"), nullable=False, index=True)
+    status = Column(String(32), default="pending", nullable=False)  # pending | done | error
     submitted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
     result_path = Column(String(1024), nullable=True)
+    similarity = Column(Float, nullable=True)
+    ai_probability = Column(Float, nullable=True)
+    summary = Column(JSON, nullable=True)  # result without fragments
 
 
 class Source(Base):
@@ -49,17 +52,22 @@ class Source(Base):
     id = Column(String(36), primary_key=True)
     title = Column(String(512), nullable=True)
     storage_path = Column(String(1024), nullable=False)
-    metadata = Column(JSON, nullable=True)
+    # "metadata" is reserved on declarative models
+    source_metadata = Column("metadata", JSON, nullable=True)
 
 
 class Fragment(Base):
     __tablename__ = "fragments"
 
     id = Column(String(36), primary_key=True)
-    job_id = Column(String(64), ForeignKey("jobs.id"), nullable=False)
-    doc_pos = Column(Integer, nullable=False)
+    job_id = Column(String(64), ForeignKey("jobs.id"), nullable=False, index=True)
+    doc_pos = Column(Integer, nullable=True)
+    rank = Column(Integer, nullable=True)  # position in the job result
     length_tokens = Column(Integer, nullable=False)
     matched_source_id = Column(String(36), ForeignKey("sources.id"), nullable=True)
-    match_type = Column(String(32), nullable=False)  # exact | fingerprint | lexical | semantic
+    match_type = Column(String(32), nullable=False)  # exact | fingerprint | lexical | semantic | combined
     score = Column(Float, nullable=False)
+    text = Column(Text, nullable=True)
+    source_title = Column(String(512), nullable=True)
+    source_url = Column(String(1024), nullable=True)
     source_excerpt = Column(Text, nullable=True)
@@ -0,0 +1,148 @@
+import uuid
+import hashlib
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from opentelemetry.trace import SpanKind
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.celery_app import celery_app
+from app.core import result_cache, metrics, tracing, scheduling, uploads, blobs
+from app.routes.upload import UPLOAD_DIR
+
+router = APIRouter()
+
+
+class BatchJob(BaseModel):
+    job_id: str
+    doc_id: str
+    filename: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    batch_id: str
+    job_id: Optional[str] = None
+    jobs: List[BatchJob]
+
+
+BATCH_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "properties": {
+                "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                "texts": {"type": "array", "items": {"type": "string"}},
+                "user_id": {"type": "string"},
+            },
+        }}},
+    }
+}
+
+
+@router.post("/batch", response_model=BatchResponse, openapi_extra=BATCH_FORM)
+async def create_batch(request: Request):
+    # The worker scores the whole batch against the corpus in one pass; every
+    # document gets its own job id for /jobs and /results, the batch job id
+    # resolves to a summary once all documents are done
+    doc_ids = []
+
+    def dest(filename: str):
+        doc_ids.append(str(uuid.uuid4()))
+        return UPLOAD_DIR / f"{doc_ids[-1]}_{filename}"
+
+    # Files are written to disk and hashed as the body arrives; one over
+    # UPLOAD_MAX_BYTES rejects the whole batch and removes the files saved so far
+    form = await uploads.receive_form(request, dest, settings.batch_max_documents)
+    files = form.files
+    texts = [text for text in form.getlist("texts") if text.strip()]
+    user_id = form.get("user_id")
+    if not files and not texts:
+        form.discard()
+        raise HTTPException(status_code=400, detail="Provide files or texts")
+    if len(files) + len(texts) > settings.batch_max_documents:
+        form.discard()
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch holds at most {settings.batch_max_documents} documents"
+        )
+
+    with tracing.tracer.start_as_current_span("POST /batch", kind=SpanKind.SERVER) as span:
+        batch_id = str(uuid.uuid4())
+        jobs = []
+        documents = []
+        total_size = 0
+
+        items = list(zip(doc_ids, files)) + [(str(uuid.uuid4()), text) for text in texts]
+        received = []
+        for doc_id, item in items:
+            document = {"job_id": str(uuid.uuid4()), "doc_id": doc_id, "user_id": user_id}
+            if isinstance(item, str):
+                content = item.encode("utf-8")
+                content_sha256 = hashlib.sha256(content).hexdigest()
+                text_ref = await run_in_threadpool(blobs.offload_text, item, content_sha256)
+                document.update({"text_ref": text_ref} if text_ref else {"text": item})
+                metrics.UPLOAD_BYTES.labels("text").observe(len(content))
+                filename = None
+                total_size += len(item)
+            else:
+                content_sha256 = item.sha256
+                document.update({"file_path": str(item.path), "title": item.filename})
+                metrics.UPLOAD_BYTES.labels("file").observe(item.size)
+                filename = item.filename
+                total_size += item.size
+
+            document.update({"content_sha256": content_sha256})
+            received.append((document, filename))
+
+        # Identical resubmissions: answered from the result cache and left out
+        # of the batch; one pipelined lookup and registration for all documents
+        result_keys = [None] * len(received)
+        if settings.result_cache_enabled:
+            result_keys = await run_in_threadpool(
+                result_cache.lookup_many, [document["content_sha256"] for document, _ in received]
+            )
+            for result_key in result_keys:
+                metrics.CACHE_REQUESTS.labels("upload", "hit" if result_key else "miss").inc()
+            hits = [
+                (f"cache_{document['doc_id']}", result_key, document["doc_id"], document.get("title"))
+                for (document, _), result_key in zip(received, result_keys)
+                if result_key
+            ]
+            if hits:
+                try:
+                    await run_in_threadpool(result_cache.register_jobs, hits)
+                except Exception:
+                    result_keys = [None] * len(received)  # Fall through to normal processing
+
+        for (document, filename), result_key in zip(received, result_keys):
+            if result_key:
+                job_id = f"cache_{document['doc_id']}"
+                jobs.append(BatchJob(job_id=job_id, doc_id=document["doc_id"], filename=filename))
+            else:
+                documents.append(document)
+                jobs.append(BatchJob(job_id=document["job_id"], doc_id=document["doc_id"], filename=filename))
+
+        span.set_attribute("batch.id", batch_id)
+        span.set_attribute("batch.size", len(jobs))
+        if not documents:
+            return BatchResponse(batch_id=batch_id, jobs=jobs)
+
+        # Batches are bulk work: they never take the interactive lane
+        job = scheduling.plan(total_size, "bulk")
+        task_payload = {"batch_id": batch_id, "documents": documents}
+        try:
+            with tracing.tracer.start_as_current_span("enqueue worker.process_batch", kind=SpanKind.PRODUCER):
+                task_payload["trace"] = tracing.inject()
+                async_result = celery_app.send_task(
+                    "worker.process_batch",
+                    args=[task_payload],
+                    queue=job["queue"],
+                    priority=job["priority"],
+                )
+        except Exception:
+            raise HTTPException(status_code=503, detail="Task queue unavailable")
+
+        return BatchResponse(batch_id=batch_id, job_id=async_result.id, jobs=jobs)
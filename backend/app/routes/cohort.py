@@ -0,0 +1,68 @@
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from app.core.celery_app import celery_app
+from app.routes.upload import UPLOAD_DIR
+
+router = APIRouter()
+
+
+class CohortRequest(BaseModel):
+    document_ids: List[str]
+    threshold: Optional[float] = None
+
+
+class CohortResponse(BaseModel):
+    job_id: str
+    cohort_id: str
+
+
+def _resolve_document(doc_id: str) -> Optional[str]:
+    # Uploads are stored as "<doc_id>_<filename>" in UPLOAD_DIR; doc ids are
+    # UUIDs, anything else (glob wildcards, path segments) matches nothing
+    try:
+        doc_id = str(uuid.UUID(doc_id))
+    except ValueError:
+        return None
+    matches = sorted(UPLOAD_DIR.glob(f"{doc_id}_*"))
+    return str(matches[0]) if matches else None
+
+
+@router.post("/cohort", response_model=CohortResponse)
+async def create_cohort(payload: CohortRequest):
+    """
+    Check uploaded files against each other (MinHash/LSH candidate pairs).
+
+    Only documents submitted as files can be part of a cohort: pasted texts
+    are not kept under their doc_id and are reported as not found.
+    """
+    document_ids = list(dict.fromkeys(payload.document_ids))
+    if len(document_ids) < 2:
+        raise HTTPException(status_code=400, detail="A cohort needs at least two documents")
+
+    documents = []
+    missing = []
+    for doc_id in document_ids:
+        file_path = _resolve_document(doc_id)
+        if file_path is None:
+            missing.append(doc_id)
+        else:
+            documents.append({"doc_id": doc_id, "file_path": file_path})
+
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Documents not found: {', '.join(missing)}")
+
+    cohort_id = str(uuid.uuid4())
+    task_payload = {"cohort_id": cohort_id, "documents": documents}
+    if payload.threshold is not None:
+        task_payload["threshold"] = payload.threshold
+
+    try:
+        async_result = celery_app.send_task("worker.process_cohort", args=[task_payload])
+    except Exception:
+        raise HTTPException(status_code=503, detail="Task queue unavailable")
+
+    return CohortResponse(job_id=async_result.id, cohort_id=cohort_id)
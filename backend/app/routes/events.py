@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.core import job_status, events
+
+router = APIRouter()
+
+
+@router.get("/events")
+async def stream_events(ids: str = Query(..., description="Comma-separated job ids")):
+    # Server-Sent Events: one "status" event per job, then "progress" and
+    # "done" events pushed by the workers; the stream ends once every job is done
+    try:
+        job_ids = job_status.parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def frames():
+        async for event in events.job_events(job_ids):
+            yield events.sse_message(event)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        # No proxy buffering, or events arrive in bursts
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws/jobs")
+async def websocket_events(websocket: WebSocket, ids: str = Query(...)):
+    # Same events as /events, one JSON message each (keepalives included, so a
+    # closed connection is noticed)
+    try:
+        job_ids = job_status.parse_ids(ids)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    await websocket.accept()
+    try:
+        async for event in events.job_events(job_ids):
+            await websocket.send_json(event or {"event": "keepalive"})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
@@ -1,15 +1,53 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+import redis
+from fastapi import APIRouter, Header, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+
 from app.core.celery_app import celery_app
+from app.core import result_cache, progress, job_status, etag, results_db
 
 router = APIRouter()
 
 
+@router.get("/jobs")
+async def get_jobs(
+    ids: str = Query(..., description="Comma-separated job ids"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    # Status of many jobs in one pipelined Redis round trip; 304 when unchanged
+    try:
+        job_ids = job_status.parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        # Redis round trip plus, for jobs it no longer knows, a database query
+        jobs = await run_in_threadpool(job_status.fetch, job_ids)
+    except redis.RedisError:
+        raise HTTPException(status_code=503, detail="Result backend unavailable")
+    return etag.json_response({"jobs": jobs}, if_none_match)
+
+
 @router.get("/jobs/{job_id}")
 async def get_job(job_id: str):
     # Development fallback: instantly mark dev_ jobs as ready
     if job_id.startswith("dev_"):
         return {"job_id": job_id, "status": "SUCCESS", "ready": True}
+    # Cache hits never reach Celery
+    if job_id.startswith("cache_"):
+        if result_cache.get_job_result(job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {"job_id": job_id, "status": "SUCCESS", "ready": True}
     res = celery_app.AsyncResult(job_id)
     if res is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    return {"job_id": job_id, "status": res.status, "ready": res.ready()}
+    response = {"job_id": job_id, "status": res.status, "ready": res.ready()}
+    # Unknown to the result backend: may have finished before it expired
+    if res.status == "PENDING" and await run_in_threadpool(results_db.get_result, job_id) is not None:
+        return {"job_id": job_id, "status": "SUCCESS", "ready": True}
+    if not response["ready"]:
+        # Stage, percent done and per-stage elapsed time published by the worker
+        job_progress = progress.get_progress(job_id)
+        if job_progress is not None:
+            response["progress"] = job_progress
+    return response
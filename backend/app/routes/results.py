@@ -1,83 +1,145 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+import redis
+from fastapi import APIRouter, Header, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
 from app.core.celery_app import celery_app
+from app.core import result_cache, profiles, job_status, etag, progress, blobs, results_db
+from app.core.admin import require_admin
 
 router = APIRouter()
 
 
+def _dev_result(job_id: str) -> dict:
+    """Mocked result for dev_ jobs (API running without a worker)."""
+    import random
+    similarity_score = round(random.uniform(0.08, 0.35), 3)
+    ai_probability = round(random.uniform(0.15, 0.75), 3)
+    
+    # Determine AI confidence level
+    if ai_probability >= 0.80:
+        ai_confidence = "Very High - Likely AI-generated"
+    elif ai_probability >= 0.60:
+        ai_confidence = "High - Probably AI-generated"
+    elif ai_probability >= 0.40:
+        ai_confidence = "Medium - Possibly AI-generated"
+    elif ai_probability >= 0.20:
+        ai_confidence = "Low - Probably human-written"
+    else:
+        ai_confidence = "Very Low - Likely human-written"
+    
+    return {
+        "doc_id": job_id.replace("dev_", ""),
+        "title": "Professional Document Analysis",
+        "summary": {
+            "similarity": similarity_score,
+            "sources": [
+                {"title": "Academic Paper Database", "url": "https://example.com/paper1"},
+                {"title": "Web Content Archive", "url": "https://example.com/web1"}
+            ],
+            "processing_time_ms": random.randint(1200, 2800)
+        },
+        "fragments": [
+            {
+                "text": "This is a sample text fragment that demonstrates content matching capabilities of the plagiarism detection system.",
+                "score": round(similarity_score * 0.9, 3),
+                "source": "Academic Research Database"
+            },
+            {
+                "text": "Another example of matched content showing similarity analysis across multiple documents and sources.",
+                "score": round(similarity_score * 0.7, 3),
+                "source": "Online Publication Archive"
+            },
+            {
+                "text": "Advanced detection algorithms identify semantic similarity patterns beyond simple text matching.",
+                "score": round(similarity_score * 0.5, 3),
+                "source": "Scientific Journal Repository"
+            }
+        ],
+        "explain": {
+            "cosine": round(similarity_score * 0.8, 3),
+            "ngram": round(similarity_score * 0.6, 3),
+            "lexical": round(similarity_score * 0.9, 3),
+            "semantic": round(similarity_score * 0.7, 3)
+        },
+        "ai_detection": {
+            "probability": ai_probability,
+            "confidence": ai_confidence,
+            "scores": {
+                "perplexity": round(random.uniform(0.3, 0.7), 3),
+                "burstiness": round(random.uniform(0.2, 0.6), 3),
+                "patterns": round(random.uniform(0.1, 0.5), 3),
+                "vocabulary": round(random.uniform(0.4, 0.8), 3),
+                "roberta": round(ai_probability * random.uniform(0.9, 1.1), 3)
+            }
+        }
+    }
+
+
+@router.get("/results")
+async def get_results(
+    ids: str = Query(..., description="Comma-separated job ids"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    # Results of many jobs in one pipelined Redis round trip (result None and
+    # the fragments found so far while running); 304 when nothing changed
+    # since the client's ETag
+    try:
+        job_ids = job_status.parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        # Redis round trip, database query and blob reads off the event loop
+        results = await run_in_threadpool(job_status.fetch, job_ids, with_results=True)
+    except redis.RedisError:
+        raise HTTPException(status_code=503, detail="Result backend unavailable")
+    for entry in results:
+        if entry["job_id"].startswith("dev_"):
+            entry.update({"result": _dev_result(entry["job_id"]), "complete": True})
+    return etag.json_response({"results": results}, if_none_match)
+
+
 @router.get("/results/{job_id}")
 async def get_result(job_id: str):
     # Development fallback: return a mocked result for dev_ jobs
     if job_id.startswith("dev_"):
-        import random
-        similarity_score = round(random.uniform(0.08, 0.35), 3)
-        ai_probability = round(random.uniform(0.15, 0.75), 3)
-        
-        # Determine AI confidence level
-        if ai_probability >= 0.80:
-            ai_confidence = "Very High - Likely AI-generated"
-        elif ai_probability >= 0.60:
-            ai_confidence = "High - Probably AI-generated"
-        elif ai_probability >= 0.40:
-            ai_confidence = "Medium - Possibly AI-generated"
-        elif ai_probability >= 0.20:
-            ai_confidence = "Low - Probably human-written"
-        else:
-            ai_confidence = "Very Low - Likely human-written"
-        
+        return {"job_id": job_id, "status": "SUCCESS", "result": _dev_result(job_id), "complete": True}
+    # Cache hits: stored result of an identical earlier submission
+    if job_id.startswith("cache_"):
+        result = result_cache.get_job_result(job_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Result not found")
+        return {"job_id": job_id, "status": "SUCCESS", "result": result, "complete": True}
+    # Persisted results: one query, independent of the result backend's TTL
+    stored = await run_in_threadpool(results_db.get_result, job_id)
+    if stored is not None:
+        return {"job_id": job_id, "status": "SUCCESS", "result": stored, "complete": True}
+    res = celery_app.AsyncResult(job_id)
+    if not res.ready():
+        # Matching fragments found so far, pushed by the worker while it scans
         return {
             "job_id": job_id,
-            "status": "SUCCESS",
-            "result": {
-                "doc_id": job_id.replace("dev_", ""),
-                "title": "Professional Document Analysis",
-                "summary": {
-                    "similarity": similarity_score,
-                    "sources": [
-                        {"title": "Academic Paper Database", "url": "https://example.com/paper1"},
-                        {"title": "Web Content Archive", "url": "https://example.com/web1"}
-                    ],
-                    "processing_time_ms": random.randint(1200, 2800)
-                },
-                "fragments": [
-                    {
-                        "text": "This is a sample text fragment that demonstrates content matching capabilities of the plagiarism detection system.",
-                        "score": round(similarity_score * 0.9, 3),
-                        "source": "Academic Research Database"
-                    },
-                    {
-                        "text": "Another example of matched content showing similarity analysis across multiple documents and sources.",
-                        "score": round(similarity_score * 0.7, 3),
-                        "source": "Online Publication Archive"
-                    },
-                    {
-                        "text": "Advanced detection algorithms identify semantic similarity patterns beyond simple text matching.",
-                        "score": round(similarity_score * 0.5, 3),
-                        "source": "Scientific Journal Repository"
-                    }
-                ],
-                "explain": {
-                    "cosine": round(similarity_score * 0.8, 3),
-                    "ngram": round(similarity_score * 0.6, 3),
-                    "lexical": round(similarity_score * 0.9, 3),
-                    "semantic": round(similarity_score * 0.7, 3)
-                },
-                "ai_detection": {
-                    "probability": ai_probability,
-                    "confidence": ai_confidence,
-                    "scores": {
-                        "perplexity": round(random.uniform(0.3, 0.7), 3),
-                        "burstiness": round(random.uniform(0.2, 0.6), 3),
-                        "patterns": round(random.uniform(0.1, 0.5), 3),
-                        "vocabulary": round(random.uniform(0.4, 0.8), 3),
-                        "roberta": round(ai_probability * random.uniform(0.9, 1.1), 3)
-                    }
-                }
-            },
+            "status": res.status,
+            "result": None,
+            "complete": False,
+            "fragments": progress.get_partial_fragments(job_id),
         }
-    res = celery_app.AsyncResult(job_id)
-    if not res.ready():
-        return {"job_id": job_id, "status": res.status, "result": None}
-    result = res.get()  # In dev, ok. In prod, prefer storing in DB and return URL.
+    # Not persisted (PERSIST_RESULTS off or database down): result backend
+    result = res.get()
+    # Large results are stored in the blob store, the backend holds a reference
+    result = await run_in_threadpool(blobs.resolve_result, result)
     if result is None:
         raise HTTPException(status_code=404, detail="Result not found")
-    return {"job_id": job_id, "status": res.status, "result": result}
+    return {"job_id": job_id, "status": res.status, "result": result, "complete": True}
+
+
+@router.get("/results/{job_id}/profile")
+async def get_profile(job_id: str, authorization: Optional[str] = Header(default=None)):
+    # Profiles expose code paths and timings: admins only
+    require_admin(authorization)
+    report = profiles.get_profile(job_id)
+    if report is None:
+        if not celery_app.AsyncResult(job_id).ready():
+            return {"job_id": job_id, "status": "PENDING", "profile": None}
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"job_id": job_id, "status": "SUCCESS", "profile": report}
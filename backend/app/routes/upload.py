@@ -1,11 +1,17 @@
 import uuid
+import hashlib
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request
+from opentelemetry.trace import SpanKind
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
+from app.config import settings
 from app.core.celery_app import celery_app
+from app.core import result_cache, metrics, tracing, scheduling, uploads, blobs
+from app.core.admin import require_admin
 
 router = APIRouter()
 
@@ -15,35 +21,129 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 class UploadResponse(BaseModel):
     job_id: str
+    doc_id: Optional[str] = None
 
 
-@router.post("/upload", response_model=UploadResponse)
-async def upload(
-    file: Optional[UploadFile] = File(default=None),
-    text: Optional[str] = Form(default=None),
-    title: Optional[str] = Form(default=None),
-    user_id: Optional[str] = Form(default=None),
-):
-    if not file and not text:
-        raise HTTPException(status_code=400, detail="Provide either file or text")
-
-    doc_id = str(uuid.uuid4())
-    payload = {"doc_id": doc_id, "title": title, "user_id": user_id}
-
-    if file:
-        dest = UPLOAD_DIR / f"{doc_id}_{file.filename}"
-        content = await file.read()
-        dest.write_bytes(content)
-        payload.update({"file_path": str(dest)})
-    else:
-        payload.update({"text": text})
-
-    # Enqueue processing task. If broker is unavailable (dev without Redis),
-    # fall back to returning a dev job id so the UI can continue.
-    try:
-        async_result = celery_app.send_task("worker.process_upload", args=[payload])
-        return UploadResponse(job_id=async_result.id)
-    except Exception:
-        # Development fallback: return a deterministic dev job id
-        dev_job_id = f"dev_{doc_id}"
-        return UploadResponse(job_id=dev_job_id)
+# Fields of the multipart form (read by uploads.receive_form, not by FastAPI,
+# so files stream straight to disk)
+UPLOAD_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "text": {"type": "string"},
+                "title": {"type": "string"},
+                "user_id": {"type": "string"},
+                "profile": {"type": "boolean", "default": False},
+                "budget_ms": {"type": "integer", "minimum": 0},
+            },
+        }}},
+    }
+}
+
+
+def _form_bool(value: Optional[str], name: str) -> bool:
+    if value is None or value.lower() in ("", "0", "false", "off", "no"):
+        return False
+    if value.lower() in ("1", "true", "on", "yes"):
+        return True
+    raise HTTPException(status_code=422, detail=f"{name} must be a boolean")
+
+
+def _form_budget(value: Optional[str]) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    if not value.isdigit():
+        raise HTTPException(status_code=422, detail="budget_ms must be a non-negative integer")
+    return int(value)
+
+
+@router.post("/upload", response_model=UploadResponse, openapi_extra=UPLOAD_FORM)
+async def upload(request: Request, authorization: Optional[str] = Header(default=None)):
+    with tracing.tracer.start_as_current_span("POST /upload", kind=SpanKind.SERVER) as span:
+        doc_id = str(uuid.uuid4())
+        # The file is written to disk and hashed as the body arrives (413 past
+        # UPLOAD_MAX_BYTES, with the partial file removed)
+        form = await uploads.receive_form(request, lambda filename: UPLOAD_DIR / f"{doc_id}_{filename}")
+        file = form.files[0] if form.files else None
+        text = form.get("text") or None
+        title = form.get("title")
+        user_id = form.get("user_id")
+        try:
+            if not file and not text:
+                raise HTTPException(status_code=400, detail="Provide either file or text")
+            profile = _form_bool(form.get("profile"), "profile")
+            budget_ms = _form_budget(form.get("budget_ms"))
+            if profile:
+                require_admin(authorization)
+        except HTTPException:
+            form.discard()
+            raise
+
+        payload = {"doc_id": doc_id, "title": title, "user_id": user_id}
+
+        if file:
+            size, content_sha256 = file.size, file.sha256
+            payload.update({"file_path": str(file.path)})
+            metrics.UPLOAD_BYTES.labels("file").observe(size)
+        else:
+            # Text fields are capped at UPLOAD_MAX_BYTES by the form reader
+            content = text.encode("utf-8")
+            size, content_sha256 = len(content), hashlib.sha256(content).hexdigest()
+            # Large texts reach the worker by reference, not inside the message
+            text_ref = await run_in_threadpool(blobs.offload_text, text, content_sha256)
+            payload.update({"text_ref": text_ref} if text_ref else {"text": text})
+            metrics.UPLOAD_BYTES.labels("text").observe(size)
+
+        # Pasted text is sized in characters, files in bytes (extraction
+        # happens in the worker)
+        job = scheduling.plan(size if file else len(text))
+        payload.update({
+            "job_class": job["job_class"],
+            "deadline": job["deadline"],
+            "enqueued_at": job["enqueued_at"],
+            # Per-request time budget overrides the class default (0 = none)
+            "budget_ms": job["budget_ms"] if budget_ms is None else budget_ms or None,
+        })
+
+        payload.update({"content_sha256": content_sha256})
+        span.set_attribute("doc.id", doc_id)
+        span.set_attribute("upload.bytes", size)
+        span.set_attribute("job.class", job["job_class"])
+
+        # Identical resubmission: answer from the result cache without enqueueing
+        # (profiled jobs always run, otherwise there is nothing to profile)
+        if profile:
+            payload.update({"profile": True})
+        elif settings.result_cache_enabled:
+            result_key = await run_in_threadpool(result_cache.lookup, content_sha256)
+            metrics.CACHE_REQUESTS.labels("upload", "hit" if result_key else "miss").inc()
+            if result_key:
+                job_id = f"cache_{doc_id}"
+                try:
+                    await run_in_threadpool(result_cache.register_job, job_id, result_key, doc_id, title)
+                    span.set_attribute("cache.hit", True)
+                    return UploadResponse(job_id=job_id, doc_id=doc_id)
+                except Exception:
+                    pass  # Fall through to normal processing
+
+        # Enqueue processing task. If broker is unavailable (dev without Redis),
+        # fall back to returning a dev job id so the UI can continue.
+        try:
+            with tracing.tracer.start_as_current_span("enqueue worker.process_upload", kind=SpanKind.PRODUCER):
+                # Worker spans continue this trace; sent_at measures queue wait
+                payload["trace"] = tracing.inject()
+                async_result = celery_app.send_task(
+                    "worker.process_upload",
+                    args=[payload],
+                    queue=job["queue"],
+                    priority=job["priority"],
+                )
+            span.set_attribute("job.id", async_result.id)
+            return UploadResponse(job_id=async_result.id, doc_id=doc_id)
+        except Exception:
+            # Development fallback: return a deterministic dev job id
+            dev_job_id = f"dev_{doc_id}"
+            return UploadResponse(job_id=dev_job_id, doc_id=doc_id)
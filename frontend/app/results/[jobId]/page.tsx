@@ -23,28 +23,36 @@ export default function ResultsPage({ params }: { params: { jobId: string } }) {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    let timer: any;
-    const poll = async () => {
+    // Status and completion are pushed over Server-Sent Events; the browser
+    // reconnects on its own and every (re)connect starts with a "status" event
+    const source = new EventSource(`${API_BASE}/api/v1/events?ids=${encodeURIComponent(jobId)}`);
+    const fetchResult = async () => {
+      source.close();
       try {
-        const res = await fetch(`${API_BASE}/api/v1/jobs/${jobId}`);
-        if (!res.ok) throw new Error(`Status fetch failed ${res.status}`);
+        const res = await fetch(`${API_BASE}/api/v1/results/${jobId}`);
+        if (!res.ok) throw new Error(`Result fetch failed ${res.status}`);
         const data = await res.json();
-        setStatus(data.status || data.state || "UNKNOWN");
-
-        if (data.ready) {
-          const res2 = await fetch(`${API_BASE}/api/v1/results/${jobId}`);
-          if (!res2.ok) throw new Error(`Result fetch failed ${res2.status}`);
-          const data2 = await res2.json();
-          setResult(data2.result || null);
-          return;
-        }
+        setResult(data.result || null);
       } catch (e: any) {
-        setError(e.message || "Polling error");
+        setError(e.message || "Result error");
       }
-      timer = setTimeout(poll, 1000);
     };
-    poll();
-    return () => clearTimeout(timer);
+    const onStatus = (e: MessageEvent) => {
+      const data = JSON.parse(e.data);
+      setStatus(data.status || "UNKNOWN");
+      if (data.ready || data.event === "done") fetchResult();
+      else if (data.status === "NOT_FOUND") source.close();
+    };
+    source.addEventListener("status", onStatus);
+    source.addEventListener("done", onStatus);
+    source.addEventListener("progress", () => setStatus("PROGRESS"));
+    source.addEventListener("error", (e: Event) => {
+      // Server-sent "error" events carry data; connection errors are retried by the browser
+      if (!(e instanceof MessageEvent)) return;
+      source.close();
+      setError(JSON.parse(e.data).detail || "Event stream error");
+    });
+    return () => source.close();
   }, [jobId]);
 
   const getSimilarityColor = (similarity: number) => {
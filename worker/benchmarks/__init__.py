@@ -0,0 +1,9 @@
+"""
+Benchmark suite for the worker.
+
+Usage (from the worker directory):
+    python -m benchmarks micro --sizes 10,100,1000 --output micro.json
+    python -m benchmarks macro --corpus-size 100 --documents 50 --output macro.json
+    python -m benchmarks evaluate --pairs 200 --configs configs.json --output eval.json
+    python -m benchmarks compare before.json after.json
+"""
@@ -0,0 +1,109 @@
+"""
+Command-line entry point: python -m benchmarks <micro|macro|evaluate|compare>
+"""
+import json
+import argparse
+
+from benchmarks.stats import environment
+
+
+def _write(report: dict, output: str):
+    print(json.dumps(report, indent=2))
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {output}")
+
+
+def _flatten(report: dict, prefix: str = "") -> dict:
+    """Map "path.to.metric" -> value for every numeric leaf."""
+    flat = {}
+    for key, value in report.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(before_path: str, after_path: str):
+    """Print p50/p95/throughput/RSS changes between two result files."""
+    with open(before_path, encoding="utf-8") as f:
+        before = _flatten(json.load(f))
+    with open(after_path, encoding="utf-8") as f:
+        after = _flatten(json.load(f))
+
+    tracked = ("p50_ms", "p95_ms", "throughput_docs_per_s", "peak_rss_mb")
+    print(f"{'metric':<60} {'before':>12} {'after':>12} {'change':>9}")
+    for path in sorted(before.keys() & after.keys()):
+        if not path.endswith(tracked):
+            continue
+        old, new = before[path], after[path]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{path:<60} {old:>12.3f} {new:>12.3f} {change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker benchmark suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    micro = subparsers.add_parser("micro", help="Per-function microbenchmarks")
+    micro.add_argument("--sizes", default="10,100,1000",
+                       help="Comma-separated corpus sizes (10 to 100000)")
+    micro.add_argument("--repeat", type=int, default=20)
+    micro.add_argument("--seed", type=int, default=42)
+    micro.add_argument("--output", default="")
+
+    macro = subparsers.add_parser("macro", help="End-to-end process_upload benchmark")
+    macro.add_argument("--corpus-size", type=int, default=100)
+    macro.add_argument("--documents", type=int, default=50)
+    macro.add_argument("--seed", type=int, default=42)
+    macro.add_argument("--output", default="")
+
+    evaluation = subparsers.add_parser("evaluate", help="Accuracy vs latency per engine configuration")
+    evaluation.add_argument("--pairs", type=int, default=200)
+    evaluation.add_argument("--ai-texts", type=int, default=200)
+    evaluation.add_argument("--configs", default="", help="JSON file with similarity / ai configurations")
+    evaluation.add_argument("--seed", type=int, default=42)
+    evaluation.add_argument("--output", default="")
+
+    diff = subparsers.add_parser("compare", help="Compare two result files")
+    diff.add_argument("before")
+    diff.add_argument("after")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        compare(args.before, args.after)
+        return
+
+    if args.command == "evaluate":
+        from benchmarks.evaluate import evaluate, format_table
+        configs = None
+        if args.configs:
+            with open(args.configs, encoding="utf-8") as f:
+                configs = json.load(f)
+        results = evaluate(args.pairs, args.ai_texts, configs, seed=args.seed)
+        print(format_table(results))
+        config = {"pairs": args.pairs, "ai_texts": args.ai_texts, "configs": configs, "seed": args.seed}
+    elif args.command == "micro":
+        from benchmarks.micro import run_micro
+        sizes = [int(size) for size in args.sizes.split(",")]
+        results = run_micro(sizes, repeat=args.repeat, seed=args.seed)
+        config = {"sizes": sizes, "repeat": args.repeat, "seed": args.seed}
+    else:
+        from benchmarks.macro import run_macro
+        results = run_macro(args.corpus_size, args.documents, seed=args.seed)
+        config = {"corpus_size": args.corpus_size, "documents": args.documents, "seed": args.seed}
+
+    _write({
+        "benchmark": args.command,
+        "environment": environment(),
+        "config": config,
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
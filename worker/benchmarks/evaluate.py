@@ -0,0 +1,242 @@
+"""
+Accuracy-vs-latency evaluation of engine configurations.
+Runs labelled synthetic data through SimilarityDetector / AIDetector
+configurations and reports precision, recall, F1 and score correlation with
+the exhaustive baseline (the first configuration of each kind), next to
+per-item latency and peak Python memory.
+
+A configuration file (JSON) replaces the built-in configurations:
+    {
+      "similarity": [
+        {"name": "exhaustive", "weights": {"cosine": 0.25, "ngram": 0.25,
+                                           "lexical": 0.25, "semantic": 0.25}},
+        {"name": "ngram_prefilter", "weights": {...},
+         "prefilter": {"scorer": "ngram", "min_score": 0.3}}
+      ],
+      "ai": [
+        {"name": "full", "weights": {...}, "windowed": false}
+      ]
+    }
+
+Scorers without a weight are not computed. A prefilter computes its scorer
+first and rejects the pair (score = prefilter score) below min_score.
+"""
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from worker.similarity import SimilarityDetector
+from worker.ai_detector import AIDetector
+
+from benchmarks.synthetic import SyntheticCorpus
+from benchmarks.stats import summarize
+
+SIMILARITY_CONFIGS = [
+    {"name": "exhaustive", "weights": dict(SimilarityDetector.DEFAULT_WEIGHTS)},
+    {"name": "no_semantic", "weights": {"cosine": 1 / 3, "ngram": 1 / 3, "lexical": 1 / 3}},
+    {"name": "cosine_only", "weights": {"cosine": 1.0}},
+    {
+        "name": "ngram_prefilter",
+        "weights": dict(SimilarityDetector.DEFAULT_WEIGHTS),
+        "prefilter": {"scorer": "ngram", "min_score": 0.3},
+    },
+]
+
+AI_CONFIGS = [
+    {"name": "full", "weights": dict(AIDetector.WEIGHTS)},
+    {
+        "name": "heuristics_only",
+        "weights": {"perplexity": 0.25, "burstiness": 0.25, "patterns": 0.25,
+                    "vocabulary": 0.25, "roberta": 0.0},
+    },
+    {"name": "windowed_roberta", "weights": dict(AIDetector.WEIGHTS), "windowed": True},
+]
+
+DEFAULT_THRESHOLD = 0.5
+# Items profiled with tracemalloc per configuration (it slows execution down)
+MEMORY_SAMPLE = 10
+
+
+def classification_metrics(labels: List[int], scores: List[float], threshold: float) -> Dict:
+    """Precision, recall and F1 of `score >= threshold` against labels."""
+    labels = np.asarray(labels, dtype=bool)
+    predicted = np.asarray(scores) >= threshold
+    tp = int(np.sum(predicted & labels))
+    fp = int(np.sum(predicted & ~labels))
+    fn = int(np.sum(~predicted & labels))
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def best_threshold(labels: List[int], scores: List[float]) -> Tuple[float, float]:
+    """Threshold with the highest F1 (threshold-independent quality of a score)."""
+    best = (0.0, DEFAULT_THRESHOLD)
+    for threshold in np.unique(np.round(scores, 3)):
+        f1 = classification_metrics(labels, scores, float(threshold))["f1"]
+        if f1 > best[0]:
+            best = (f1, float(threshold))
+    return best
+
+
+def correlation(scores: List[float], baseline: List[float]) -> Dict:
+    """Pearson and Spearman correlation with the baseline scores."""
+    a, b = np.asarray(scores, dtype=float), np.asarray(baseline, dtype=float)
+    if a.std() == 0 or b.std() == 0:
+        return {"pearson": None, "spearman": None}
+    ranks_a = np.argsort(np.argsort(a))
+    ranks_b = np.argsort(np.argsort(b))
+    return {
+        "pearson": round(float(np.corrcoef(a, b)[0, 1]), 4),
+        "spearman": round(float(np.corrcoef(ranks_a, ranks_b)[0, 1]), 4),
+    }
+
+
+def similarity_score(detector: SimilarityDetector, config: Dict, text1: str, text2: str) -> float:
+    """Score one pair under a similarity configuration."""
+    weights = config["weights"]
+    scores = {}
+
+    prefilter = config.get("prefilter")
+    if prefilter:
+        scorer = prefilter["scorer"]
+        scores[scorer] = getattr(detector, f"{scorer}_similarity_score")(text1, text2)
+        if scores[scorer] < prefilter["min_score"]:
+            return scores[scorer]
+
+    for scorer, weight in weights.items():
+        if weight and scorer not in scores:
+            scores[scorer] = getattr(detector, f"{scorer}_similarity_score")(text1, text2)
+    return sum(scores[scorer] * weight for scorer, weight in weights.items() if weight)
+
+
+def ai_score(detector: AIDetector, config: Dict, text: str) -> float:
+    """AI probability of one text under an AI configuration."""
+    weights = config["weights"]
+    detector.WEIGHTS = weights  # instance attribute shadows the class default
+
+    roberta_score = None
+    if not weights.get("roberta"):
+        roberta_score = 0.0  # weight 0: skip the model entirely
+    elif config.get("windowed"):
+        roberta_score, _ = detector.roberta_classify_windows(text)
+
+    probability, _ = detector.detect_ai_comprehensive(text, roberta_score=roberta_score)
+    return probability
+
+
+def _run_config(score_fn, items: List, labels: List[int], threshold: float) -> Dict:
+    scores, latencies = [], []
+    for item in items:
+        start = time.perf_counter()
+        scores.append(float(score_fn(item)))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    for item in items[:MEMORY_SAMPLE]:
+        score_fn(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    f1, tuned = best_threshold(labels, scores)
+    return {
+        "scores": scores,
+        "threshold": threshold,
+        **classification_metrics(labels, scores, threshold),
+        "best_f1": f1,
+        "best_threshold": tuned,
+        "latency": summarize(latencies),
+        "peak_python_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def _finish(results: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Attach baseline correlation and drop raw scores."""
+    baseline = next(iter(results.values()))["scores"]
+    for result in results.values():
+        result["correlation"] = correlation(result["scores"], baseline)
+    for result in results.values():
+        del result["scores"]
+    return results
+
+
+def evaluate(
+    pairs: int = 200,
+    ai_texts: int = 200,
+    configs: Dict = None,
+    seed: int = 42
+) -> Dict:
+    """
+    Evaluate every configuration on the same labelled data.
+
+    Args:
+        pairs: Labelled similarity pairs (half derived, half unrelated)
+        ai_texts: Labelled AI-style / human-style texts
+        configs: {"similarity": [...], "ai": [...]}; built-ins when omitted
+        seed: Synthetic data seed
+
+    Returns:
+        {"similarity": {name: metrics}, "ai": {name: metrics}}
+    """
+    configs = configs or {}
+    similarity_configs = configs.get("similarity", SIMILARITY_CONFIGS)
+    ai_configs = configs.get("ai", AI_CONFIGS)
+    corpus = SyntheticCorpus(seed=seed)
+    report = {}
+
+    if similarity_configs and pairs:
+        detector = SimilarityDetector()
+        data = list(corpus.pairs(pairs))
+        labels = [pair["label"] for pair in data]
+        results = {}
+        for config in similarity_configs:
+            results[config["name"]] = _run_config(
+                lambda pair, config=config: similarity_score(detector, config, pair["text1"], pair["text2"]),
+                data,
+                labels,
+                config.get("threshold", DEFAULT_THRESHOLD)
+            )
+            print(f"evaluate: similarity config {config['name']} done")
+        report["similarity"] = _finish(results)
+
+    if ai_configs and ai_texts:
+        ai_detector = AIDetector()
+        data = list(corpus.ai_samples(ai_texts))
+        labels = [sample["label"] for sample in data]
+        results = {}
+        for config in ai_configs:
+            results[config["name"]] = _run_config(
+                lambda sample, config=config: ai_score(ai_detector, config, sample["text"]),
+                data,
+                labels,
+                config.get("threshold", DEFAULT_THRESHOLD)
+            )
+            print(f"evaluate: ai config {config['name']} done")
+        report["ai"] = _finish(results)
+
+    return report
+
+
+def format_table(report: Dict) -> str:
+    """Comparison table per configuration kind."""
+    header = (f"{'config':<20} {'P':>6} {'R':>6} {'F1':>6} {'bestF1':>7} {'@thr':>6} "
+              f"{'pearson':>8} {'spearman':>9} {'p50 ms':>9} {'p95 ms':>9} {'mem MB':>7}")
+    lines = []
+    for kind, results in report.items():
+        lines.append(f"[{kind}] baseline = {next(iter(results))}")
+        lines.append(header)
+        for name, r in results.items():
+            corr = r["correlation"]
+            lines.append(
+                f"{name:<20} {r['precision']:>6.3f} {r['recall']:>6.3f} {r['f1']:>6.3f} "
+                f"{r['best_f1']:>7.3f} {r['best_threshold']:>6.3f} "
+                f"{corr['pearson'] if corr['pearson'] is not None else float('nan'):>8.3f} "
+                f"{corr['spearman'] if corr['spearman'] is not None else float('nan'):>9.3f} "
+                f"{r['latency']['p50_ms']:>9.3f} {r['latency']['p95_ms']:>9.3f} "
+                f"{r['peak_python_mb']:>7.2f}"
+            )
+        lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,62 @@
+"""
+End-to-end benchmark of process_upload.
+Runs the task body in-process (serial pipeline, result cache off) against a
+synthetic reference corpus and reports latency percentiles, throughput and
+peak RSS.
+"""
+import os
+import time
+from typing import Dict
+
+from benchmarks.synthetic import SyntheticCorpus
+from benchmarks.stats import summarize, peak_rss_mb
+
+
+def run_macro(corpus_size: int = 100, documents: int = 50, seed: int = 42) -> Dict:
+    """
+    Benchmark process_upload on synthetic suspicious documents.
+
+    Args:
+        corpus_size: Reference documents in the corpus
+        documents: Suspicious documents to process
+        seed: Synthetic corpus seed
+
+    Returns:
+        {"latency": summary, "throughput_docs_per_s", "peak_rss_mb", ...}
+    """
+    # Must be set before worker.app reads its configuration
+    os.environ.setdefault("PIPELINE_MODE", "serial")
+    os.environ.setdefault("RESULT_CACHE_ENABLED", "false")
+    os.environ.setdefault("INCREMENTAL_RECHECK", "false")
+    os.environ.setdefault("METRICS_PORT", "0")
+
+    from worker import app as worker_app
+
+    corpus = SyntheticCorpus(seed=seed)
+    worker_app.corpus_manager.corpus = list(corpus.sources(corpus_size))
+    worker_app.corpus_manager._version = None
+
+    # First call loads models and normalizes the corpus; not part of the numbers
+    worker_app.process_upload({"doc_id": "warmup", "text": corpus.unrelated(0)})
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for index in range(documents):
+        document = corpus.suspicious(index, corpus_size)
+        call_start = time.perf_counter()
+        result = worker_app.process_upload({"doc_id": f"bench_{index}", "text": document["text"]})
+        latencies.append((time.perf_counter() - call_start) * 1000)
+        if result.get("error"):
+            errors += 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "pipeline_mode": worker_app.PIPELINE_MODE,
+        "corpus_size": corpus_size,
+        "documents": documents,
+        "errors": errors,
+        "latency": summarize(latencies),
+        "throughput_docs_per_s": round(documents / elapsed, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
@@ -0,0 +1,122 @@
+"""
+Per-function microbenchmarks.
+Size-independent functions are timed on one synthetic document; corpus-bound
+functions are timed against synthetic corpora of each requested size.
+"""
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from worker.preprocessor import TextPreprocessor
+from worker.similarity import SimilarityDetector
+from worker.ai_detector import AIDetector
+from worker.extractors import DocumentExtractor
+
+from benchmarks.synthetic import SyntheticCorpus
+from benchmarks.stats import time_call, peak_rss_mb
+
+# Calls per corpus-size benchmark are capped to roughly this many document comparisons
+COMPARISON_BUDGET = 20000
+
+
+def _write_documents(directory: str, text: str) -> Dict[str, str]:
+    """Write the same text as TXT, DOCX and PDF for the extractor benchmarks."""
+    import fitz
+    from docx import Document
+
+    paths = {}
+
+    paths["txt"] = os.path.join(directory, "sample.txt")
+    with open(paths["txt"], "w", encoding="utf-8") as f:
+        f.write(text)
+
+    paths["docx"] = os.path.join(directory, "sample.docx")
+    document = Document()
+    for paragraph in text.split(". "):
+        document.add_paragraph(paragraph)
+    document.save(paths["docx"])
+
+    paths["pdf"] = os.path.join(directory, "sample.pdf")
+    pdf = fitz.open()
+    page = pdf.new_page()
+    page.insert_textbox(fitz.Rect(36, 36, 576, 806), text, fontsize=9)
+    pdf.save(paths["pdf"])
+    pdf.close()
+
+    return paths
+
+
+def run_micro(sizes: List[int], repeat: int = 20, seed: int = 42) -> Dict:
+    """
+    Run all microbenchmarks.
+
+    Args:
+        sizes: Corpus sizes for corpus-bound functions
+        repeat: Timed calls per benchmark (reduced for large corpora)
+        seed: Synthetic corpus seed
+
+    Returns:
+        {"functions": {name: summary}, "corpus": {size: {name: summary}}, "peak_rss_mb"}
+    """
+    corpus = SyntheticCorpus(seed=seed)
+    preprocessor = TextPreprocessor()
+    detector = SimilarityDetector()
+    ai_detector = AIDetector()
+
+    suspicious = corpus.suspicious(0, corpus_size=max(sizes), obfuscation="copy")["text"]
+    reference = corpus.source(0)["text"]
+    normalized_suspicious = preprocessor.normalize(suspicious)
+    normalized_reference = preprocessor.normalize(reference)
+
+    functions = {
+        "normalize": time_call(lambda: preprocessor.normalize(suspicious), repeat),
+        "cosine_similarity_score": time_call(
+            lambda: detector.cosine_similarity_score(normalized_suspicious, normalized_reference),
+            repeat
+        ),
+        "combined_similarity_score": time_call(
+            lambda: detector.combined_similarity_score(normalized_suspicious, normalized_reference),
+            repeat
+        ),
+        "detect_ai_comprehensive": time_call(
+            lambda: ai_detector.detect_ai_comprehensive(suspicious),
+            repeat
+        ),
+    }
+
+    # Same detector (and loaded model) with the scorers on a thread pool
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        detector.executor = executor
+        functions["combined_similarity_score_concurrent"] = time_call(
+            lambda: detector.combined_similarity_score(normalized_suspicious, normalized_reference),
+            repeat
+        )
+        detector.executor = None
+
+    with tempfile.TemporaryDirectory() as directory:
+        for kind, path in _write_documents(directory, suspicious).items():
+            functions[f"extract_{kind}"] = time_call(lambda: DocumentExtractor.extract(path), repeat)
+
+    by_size = {}
+    for size in sizes:
+        normalized_corpus = [preprocessor.normalize(doc["text"]) for doc in corpus.sources(size)]
+        size_repeat = max(1, min(repeat, COMPARISON_BUDGET // size))
+        by_size[str(size)] = {
+            "find_matching_fragments": time_call(
+                lambda: detector.find_matching_fragments(normalized_suspicious, normalized_corpus),
+                size_repeat,
+                warmup=1
+            ),
+            "cosine_scan": time_call(
+                lambda: [
+                    detector.cosine_similarity_score(normalized_suspicious, text)
+                    for text in normalized_corpus
+                ],
+                size_repeat,
+                warmup=0
+            ),
+        }
+        print(f"micro: corpus size {size} done")
+
+    return {"functions": functions, "corpus": by_size, "peak_rss_mb": peak_rss_mb()}
@@ -0,0 +1,79 @@
+"""
+Timing and memory helpers shared by the benchmarks.
+"""
+import gc
+import os
+import sys
+import time
+import platform
+import resource
+import subprocess
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+def summarize(samples_ms: List[float]) -> Dict:
+    """Latency summary of a list of samples in milliseconds."""
+    samples = np.asarray(samples_ms, dtype=float)
+    return {
+        "n": int(samples.size),
+        "mean_ms": round(float(samples.mean()), 4),
+        "p50_ms": round(float(np.percentile(samples, 50)), 4),
+        "p95_ms": round(float(np.percentile(samples, 95)), 4),
+        "min_ms": round(float(samples.min()), 4),
+        "max_ms": round(float(samples.max()), 4),
+    }
+
+
+def time_call(fn: Callable, repeat: int = 20, warmup: int = 2) -> Dict:
+    """
+    Time repeated calls of fn.
+
+    Args:
+        fn: Zero-argument callable
+        repeat: Timed calls
+        warmup: Untimed calls first (lazy init, caches)
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return summarize(samples)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def environment() -> Dict:
+    """Metadata that identifies a run for comparisons between commits."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
@@ -0,0 +1,248 @@
+"""
+Deterministic synthetic corpus generator.
+Produces reference documents and suspicious documents derived from them with
+controlled obfuscation, at any corpus size (documents are generated lazily and
+independently, so 100k-document corpora stream without being held in memory).
+
+Obfuscation types:
+    copy        verbatim passages of the source inserted into unrelated text
+    paraphrase  a fraction of content words replaced by fixed "synonyms",
+                some words dropped
+    shuffle     source sentences in a different order
+    none        unrelated document (negative example)
+"""
+import random
+import itertools
+from typing import Dict, Iterator, List, Optional
+
+OBFUSCATIONS = ("copy", "paraphrase", "shuffle")
+
+FUNCTION_WORDS = [
+    "the", "of", "and", "a", "to", "in", "is", "that", "for", "it", "as", "with",
+    "on", "by", "this", "are", "be", "from", "or", "which", "an", "can", "their",
+    "more", "these", "has", "its", "into", "between", "most", "also", "such",
+]
+
+# Stock phrases of machine-written prose (subset of AIDetector's pattern lists)
+AI_PHRASES = [
+    "Furthermore,", "Moreover,", "Additionally,", "In conclusion,", "It is important to note that",
+    "It is worth noting that", "In today's world,", "Overall,", "As a result,", "Consequently,",
+]
+
+_ONSETS = ["b", "c", "d", "f", "g", "l", "m", "n", "p", "r", "s", "t", "v", "st", "pr", "tr", "cl", "gr"]
+_NUCLEI = ["a", "e", "i", "o", "u", "ai", "ea", "io", "ou"]
+_CODAS = ["", "n", "r", "s", "t", "l", "m", "nt", "st", "ng"]
+
+
+class SyntheticCorpus:
+    """Seeded generator of reference documents and obfuscated derivatives."""
+
+    def __init__(
+        self,
+        seed: int = 42,
+        vocab_size: int = 5000,
+        sentences_per_doc: tuple = (8, 20),
+        words_per_sentence: tuple = (8, 24)
+    ):
+        """
+        Args:
+            seed: Master seed; the same seed always yields the same corpus
+            vocab_size: Number of pseudo-words in the content vocabulary
+            sentences_per_doc: (min, max) sentences per document
+            words_per_sentence: (min, max) words per sentence
+        """
+        self.seed = seed
+        self.sentences_per_doc = sentences_per_doc
+        self.words_per_sentence = words_per_sentence
+
+        rng = random.Random(seed)
+        vocab = set()
+        while len(vocab) < vocab_size:
+            syllables = rng.randint(2, 4)
+            vocab.add("".join(
+                rng.choice(_ONSETS) + rng.choice(_NUCLEI) + rng.choice(_CODAS)
+                for _ in range(syllables)
+            ))
+        self.vocab = sorted(vocab)
+        # Zipf-like weights so some content words recur across documents
+        self.cum_weights = list(itertools.accumulate(
+            1.0 / (rank + 1) ** 0.8 for rank in range(len(self.vocab))
+        ))
+
+        # Fixed synonym pairs for paraphrasing
+        shuffled = self.vocab[:]
+        rng.shuffle(shuffled)
+        self.synonyms = dict(zip(self.vocab, shuffled))
+
+    def _rng(self, kind: str, index: int) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{index}")
+
+    def _sentence(self, rng: random.Random) -> str:
+        length = rng.randint(*self.words_per_sentence)
+        content = rng.choices(self.vocab, cum_weights=self.cum_weights, k=length)
+        words = [
+            rng.choice(FUNCTION_WORDS) if rng.random() < 0.4 else word
+            for word in content
+        ]
+        return words[0].capitalize() + " " + " ".join(words[1:]) + "."
+
+    def _text(self, rng: random.Random) -> str:
+        count = rng.randint(*self.sentences_per_doc)
+        return " ".join(self._sentence(rng) for _ in range(count))
+
+    def source(self, index: int) -> Dict[str, str]:
+        """Reference document `index` in CorpusManager format."""
+        rng = self._rng("source", index)
+        return {
+            "id": f"synthetic_{index}",
+            "title": f"Synthetic Reference {index}",
+            "text": self._text(rng),
+            "url": f"https://synthetic.example.com/{index}",
+        }
+
+    def sources(self, count: int) -> Iterator[Dict[str, str]]:
+        """First `count` reference documents."""
+        for index in range(count):
+            yield self.source(index)
+
+    def unrelated(self, index: int) -> str:
+        """Document sharing no passages with any reference document."""
+        return self._text(self._rng("unrelated", index))
+
+    def obfuscate(
+        self,
+        source_text: str,
+        obfuscation: str,
+        rng: random.Random,
+        strength: float = 0.3
+    ) -> str:
+        """
+        Derive a suspicious text from a source text.
+
+        Args:
+            source_text: Reference text
+            obfuscation: One of OBFUSCATIONS
+            rng: Random generator (determines the derivative)
+            strength: copy = share of fresh filler text,
+                paraphrase = share of words replaced,
+                shuffle = unused (all sentences are permuted)
+        """
+        sentences = [s.strip() + "." for s in source_text.split(".") if s.strip()]
+
+        if obfuscation == "copy":
+            # Copy a contiguous run of sentences and surround it with fresh text
+            run = max(1, int(len(sentences) * (1 - strength)))
+            start = rng.randint(0, len(sentences) - run)
+            filler = self._text(rng).split(". ")
+            cut = rng.randint(0, len(filler))
+            parts = filler[:cut] + sentences[start:start + run] + filler[cut:]
+            return " ".join(part if part.endswith(".") else part + "." for part in parts)
+
+        if obfuscation == "paraphrase":
+            words = []
+            for word in source_text.split():
+                bare = word.rstrip(".").lower()
+                roll = rng.random()
+                if roll < strength * 0.2:
+                    continue  # dropped word
+                if roll < strength and bare in self.synonyms:
+                    replacement = self.synonyms[bare]
+                    if word[0].isupper():
+                        replacement = replacement.capitalize()
+                    words.append(replacement + ("." if word.endswith(".") else ""))
+                else:
+                    words.append(word)
+            return " ".join(words)
+
+        if obfuscation == "shuffle":
+            shuffled = sentences[:]
+            rng.shuffle(shuffled)
+            return " ".join(shuffled)
+
+        raise ValueError(f"Unknown obfuscation: {obfuscation}")
+
+    def suspicious(
+        self,
+        index: int,
+        corpus_size: int,
+        obfuscation: Optional[str] = None,
+        strength: float = 0.3
+    ) -> Dict:
+        """
+        Suspicious document `index` derived from a random reference document.
+
+        Args:
+            index: Document number
+            corpus_size: Reference documents to choose the source from
+            obfuscation: Obfuscation type, or None to cycle through OBFUSCATIONS
+            strength: Obfuscation strength (see obfuscate)
+
+        Returns:
+            {"text", "source_index", "obfuscation"}
+        """
+        rng = self._rng("suspicious", index)
+        obfuscation = obfuscation or OBFUSCATIONS[index % len(OBFUSCATIONS)]
+        source_index = rng.randrange(corpus_size)
+        return {
+            "text": self.obfuscate(self.source(source_index)["text"], obfuscation, rng, strength),
+            "source_index": source_index,
+            "obfuscation": obfuscation,
+        }
+
+    def pairs(
+        self,
+        count: int,
+        positive_ratio: float = 0.5,
+        strengths: List[float] = (0.1, 0.3, 0.5)
+    ) -> Iterator[Dict]:
+        """
+        Labelled (suspicious, reference) pairs for accuracy evaluation.
+
+        Yields:
+            {"text1", "text2", "label", "obfuscation", "strength"}; label 1 means
+            text1 was derived from text2, label 0 means unrelated
+        """
+        positives = 0
+        for index in range(count):
+            rng = self._rng("pair", index)
+            reference = self.source(count + index)["text"]
+            if rng.random() < positive_ratio:
+                # Cycle through every obfuscation x strength combination
+                obfuscation = OBFUSCATIONS[positives % len(OBFUSCATIONS)]
+                strength = strengths[(positives // len(OBFUSCATIONS)) % len(strengths)]
+                positives += 1
+                text = self.obfuscate(reference, obfuscation, rng, strength)
+                yield {"text1": text, "text2": reference, "label": 1,
+                       "obfuscation": obfuscation, "strength": strength}
+            else:
+                yield {"text1": self.unrelated(index), "text2": reference, "label": 0,
+                       "obfuscation": "none", "strength": 0.0}
+
+    def ai_samples(self, count: int, ai_ratio: float = 0.5) -> Iterator[Dict]:
+        """
+        Labelled texts for AI-detection evaluation.
+        AI-style texts (label 1) have uniform sentence lengths and open many
+        sentences with stock transition phrases; human-style texts (label 0)
+        mix very short and very long sentences, questions and exclamations.
+
+        Yields:
+            {"text", "label"}
+        """
+        for index in range(count):
+            rng = self._rng("ai", index)
+            sentences = []
+            if rng.random() < ai_ratio:
+                for _ in range(rng.randint(*self.sentences_per_doc)):
+                    length = rng.randint(16, 20)
+                    words = rng.choices(self.vocab, cum_weights=self.cum_weights, k=length)
+                    opener = rng.choice(AI_PHRASES) + " " if rng.random() < 0.5 else ""
+                    sentence = " ".join(words) + "."
+                    sentences.append(opener + sentence if opener else sentence.capitalize())
+                yield {"text": " ".join(sentences), "label": 1}
+            else:
+                for _ in range(rng.randint(*self.sentences_per_doc)):
+                    length = rng.choice([rng.randint(2, 6), rng.randint(8, 16), rng.randint(25, 45)])
+                    words = rng.choices(self.vocab, cum_weights=self.cum_weights, k=length)
+                    words = [rng.choice(FUNCTION_WORDS) if rng.random() < 0.4 else w for w in words]
+                    sentences.append(" ".join(words).capitalize() + rng.choice([".", ".", ".", "?", "!"]))
+                yield {"text": " ".join(sentences), "label": 0}
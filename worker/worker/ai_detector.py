@@ -10,11 +10,39 @@ Methods:
 """
 import re
 import math
+import time
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import Counter
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
+from opentelemetry import trace
+
+tracer = trace.get_tracer(__name__)
+
+
+WORD_RE = re.compile(r'\b\w+\b')
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+
+class TextFeatures:
+    """
+    Shared text analysis consumed by all AI heuristics.
+    Produced once per document by AIDetector.extract_features.
+    """
+    
+    def __init__(
+        self,
+        words: List[str],
+        whitespace_word_count: int,
+        sentence_lengths: List[int],
+        pattern_counts: Dict[str, int]
+    ):
+        self.words = words
+        self.word_counts = Counter(words)
+        self.whitespace_word_count = whitespace_word_count
+        self.sentence_lengths = sentence_lengths
+        self.pattern_counts = pattern_counts
 
 
 class AIDetector:
@@ -23,11 +51,36 @@ class AIDetector:
     Combines statistical analysis and deep learning for robust detection.
     """
     
-    def __init__(self):
-        """Initialize AI detector with models."""
+    # RoBERTa fine-tuned for AI detection, with a lightweight fallback
+    ROBERTA_MODEL_NAME = "roberta-base-openai-detector"
+    ROBERTA_FALLBACK_MODEL_NAME = "distilroberta-base"
+    
+    # Weighted combination
+    # RoBERTa gets highest weight as it's most accurate
+    WEIGHTS = {
+        'perplexity': 0.15,
+        'burstiness': 0.15,
+        'patterns': 0.15,
+        'vocabulary': 0.15,
+        'roberta': 0.40  # Highest weight for deep learning model
+    }
+    
+    def __init__(self, inference_client=None, perplexity_scorer=None):
+        """
+        Initialize AI detector with models.
+        
+        Args:
+            inference_client: Optional InferenceClient; when set, RoBERTa
+                classification is delegated to the shared inference server
+            perplexity_scorer: Optional LMPerplexityScorer; when set,
+                perplexity comes from a causal language model instead of
+                unigram word entropy
+        """
         self.roberta_model = None
         self.roberta_tokenizer = None
         self._model_loaded = False
+        self.inference_client = inference_client
+        self.perplexity_scorer = perplexity_scorer
         
         # AI writing patterns (common in GPT outputs)
         self.ai_patterns = {
@@ -48,22 +101,87 @@ class AIDetector:
                 r'\b(delve into|dive into|explore the nuances)\b',
             ]
         }
+        self._pattern_regex, self._shared_phrases = self._compile_patterns(self.ai_patterns)
+    
+    @staticmethod
+    def _compile_patterns(ai_patterns: Dict[str, List[str]]) -> Tuple[re.Pattern, Dict[str, List[str]]]:
+        """
+        Compile all AI patterns into one alternation with a named group per
+        pattern type, so a single scan counts every pattern type.
+        
+        Returns:
+            Tuple of (compiled regex, phrase -> additional pattern types) for
+            phrases listed under more than one type (e.g. 'furthermore')
+        """
+        owner = {}
+        shared = {}
+        groups = []
+        
+        for pattern_type, patterns in ai_patterns.items():
+            phrases = []
+            for pattern in patterns:
+                # Patterns have the form \b(alt1|alt2|...)\b
+                for phrase in pattern[len(r'\b('):-len(r')\b')].split('|'):
+                    key = phrase.replace('\\', '').lower()
+                    if key in owner:
+                        shared.setdefault(key, []).append(pattern_type)
+                    else:
+                        owner[key] = pattern_type
+                        phrases.append(phrase)
+            
+            # Longest first so a shorter phrase never shadows a longer one
+            phrases.sort(key=len, reverse=True)
+            groups.append(f"(?P<{pattern_type}>{'|'.join(phrases)})")
+        
+        regex = re.compile(r'\b(?:' + '|'.join(groups) + r')\b', re.IGNORECASE)
+        return regex, shared
+    
+    def extract_features(self, text: str) -> TextFeatures:
+        """
+        Tokenize the text once and scan all AI patterns in a single pass.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            TextFeatures shared by perplexity, burstiness, patterns and vocabulary
+        """
+        text_lower = text.lower()
+        
+        sentence_lengths = []
+        for sentence in SENTENCE_SPLIT_RE.split(text):
+            length = len(sentence.split())
+            if length:
+                sentence_lengths.append(length)
+        
+        pattern_counts = {pattern_type: 0 for pattern_type in self.ai_patterns}
+        for match in self._pattern_regex.finditer(text_lower):
+            pattern_counts[match.lastgroup] += 1
+            for pattern_type in self._shared_phrases.get(match.group(), ()):
+                pattern_counts[pattern_type] += 1
+        
+        return TextFeatures(
+            words=WORD_RE.findall(text_lower),
+            whitespace_word_count=len(text.split()),
+            sentence_lengths=sentence_lengths,
+            pattern_counts=pattern_counts
+        )
     
     def _load_roberta_model(self):
         """Lazy load RoBERTa model for AI detection."""
         if not self._model_loaded:
             try:
                 # Using RoBERTa fine-tuned for AI detection
-                model_name = "roberta-base-openai-detector"
+                model_name = self.ROBERTA_MODEL_NAME
                 # Fallback to general RoBERTa if specific model not available
                 try:
                     self.roberta_tokenizer = AutoTokenizer.from_pretrained(model_name)
                     self.roberta_model = AutoModelForSequenceClassification.from_pretrained(model_name)
                 except:
                     # Use distilroberta as lightweight alternative
-                    self.roberta_tokenizer = AutoTokenizer.from_pretrained("distilroberta-base")
+                    self.roberta_tokenizer = AutoTokenizer.from_pretrained(self.ROBERTA_FALLBACK_MODEL_NAME)
                     self.roberta_model = AutoModelForSequenceClassification.from_pretrained(
-                        "distilroberta-base",
+                        self.ROBERTA_FALLBACK_MODEL_NAME,
                         num_labels=2
                     )
                 
@@ -73,13 +191,14 @@ class AIDetector:
                 print(f"Warning: Could not load RoBERTa model: {e}")
                 self._model_loaded = False
     
-    def calculate_perplexity(self, text: str) -> float:
+    def calculate_perplexity(self, text: str, features: Optional[TextFeatures] = None) -> float:
         """
         Calculate perplexity score.
         Lower perplexity = more predictable = more likely AI-generated.
         
         Args:
             text: Input text
+            features: Precomputed TextFeatures (extracted here when omitted)
             
         Returns:
             Perplexity score (lower = more AI-like)
@@ -87,15 +206,21 @@ class AIDetector:
         if not text or len(text.strip()) < 10:
             return 100.0  # High perplexity for very short text
         
-        # Tokenize into words
-        words = re.findall(r'\b\w+\b', text.lower())
+        # Model-based perplexity when a language model is configured
+        if self.perplexity_scorer is not None:
+            lm_perplexity = self.perplexity_scorer.perplexity(text)
+            if lm_perplexity is not None:
+                return min(100, max(0, lm_perplexity))
+        
+        # Fallback: unigram entropy over word frequencies
+        features = features or self.extract_features(text)
         
-        if len(words) < 5:
+        if len(features.words) < 5:
             return 100.0
         
-        # Calculate word frequencies
-        word_freq = Counter(words)
-        total_words = len(words)
+        # Word frequencies come from the shared tokenization
+        word_freq = features.word_counts
+        total_words = len(features.words)
         
         # Calculate entropy (simplified perplexity)
         entropy = 0.0
@@ -113,7 +238,7 @@ class AIDetector:
         
         return normalized
     
-    def calculate_burstiness(self, text: str) -> float:
+    def calculate_burstiness(self, text: str, features: Optional[TextFeatures] = None) -> float:
         """
         Calculate burstiness score.
         AI text has lower burstiness (more uniform sentence lengths).
@@ -121,19 +246,18 @@ class AIDetector:
         
         Args:
             text: Input text
+            features: Precomputed TextFeatures (extracted here when omitted)
             
         Returns:
             Burstiness score (0-1, lower = more AI-like)
         """
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        features = features or self.extract_features(text)
         
-        if len(sentences) < 3:
-            return 0.5  # Neutral for very short text
+        # Sentence lengths (in words) from the shared analysis
+        lengths = features.sentence_lengths
         
-        # Calculate sentence lengths
-        lengths = [len(s.split()) for s in sentences]
+        if len(lengths) < 3:
+            return 0.5  # Neutral for very short text
         
         if len(lengths) < 2:
             return 0.5
@@ -154,29 +278,26 @@ class AIDetector:
         # Human typically has burstiness > 0.5
         return normalized
     
-    def detect_ai_patterns(self, text: str) -> Dict[str, float]:
+    def detect_ai_patterns(self, text: str, features: Optional[TextFeatures] = None) -> Dict[str, float]:
         """
         Detect linguistic patterns common in AI-generated text.
         
         Args:
             text: Input text
+            features: Precomputed TextFeatures (extracted here when omitted)
             
         Returns:
             Dictionary of pattern scores
         """
-        text_lower = text.lower()
-        word_count = len(text.split())
+        features = features or self.extract_features(text)
+        word_count = features.whitespace_word_count
         
         if word_count == 0:
             return {'hedging': 0.0, 'formal_transitions': 0.0, 'ai_phrases': 0.0}
         
         scores = {}
         
-        for pattern_type, patterns in self.ai_patterns.items():
-            matches = 0
-            for pattern in patterns:
-                matches += len(re.findall(pattern, text_lower, re.IGNORECASE))
-            
+        for pattern_type, matches in features.pattern_counts.items():
             # Normalize by text length (matches per 100 words)
             score = (matches / word_count) * 100
             scores[pattern_type] = min(1.0, score)  # Cap at 1.0
@@ -194,53 +315,229 @@ class AIDetector:
             Probability that text is AI-generated (0-1)
         """
         try:
-            self._load_roberta_model()
+            if self.inference_client is not None:
+                return self.inference_client.roberta_classify(text)
             
-            if not self._model_loaded or self.roberta_model is None:
-                return 0.5  # Neutral if model not available
+            return self.roberta_classify_batch([text])[0]
             
-            # Tokenize
+        except Exception as e:
+            print(f"Error in RoBERTa classification: {e}")
+            return 0.5  # Neutral on error
+    
+    def roberta_classify_batch(self, texts: List[str], batch_size: int = 16) -> List[float]:
+        """
+        Classify several texts with padded batched forward passes.
+        
+        Args:
+            texts: Input texts (sort by length beforehand to minimize padding)
+            batch_size: Number of texts per forward pass
+            
+        Returns:
+            Probability that each text is AI-generated (0-1)
+        """
+        self._load_roberta_model()
+        
+        if not self._model_loaded or self.roberta_model is None:
+            return [0.5] * len(texts)  # Neutral if model not available
+        
+        probabilities = []
+        for start in range(0, len(texts), batch_size):
             inputs = self.roberta_tokenizer(
-                text,
+                texts[start:start + batch_size],
                 return_tensors="pt",
                 truncation=True,
                 max_length=512,
                 padding=True
             )
             
-            # Get prediction
-            with torch.no_grad():
-                outputs = self.roberta_model(**inputs)
-                logits = outputs.logits
+            with tracer.start_as_current_span("roberta.forward") as span, torch.no_grad():
+                span.set_attribute("batch_size", inputs["input_ids"].shape[0])
+                span.set_attribute("seq_len", inputs["input_ids"].shape[1])
+                logits = self.roberta_model(**inputs).logits
                 probs = torch.softmax(logits, dim=1)
-                
-                # Assuming label 1 is "AI-generated"
-                ai_prob = probs[0][1].item()
             
-            return ai_prob
+            # Assuming label 1 is "AI-generated"
+            probabilities.extend(probs[:, 1].tolist())
+        
+        return probabilities
+    
+    def roberta_windows(
+        self,
+        text: str,
+        window_size: int = 512,
+        stride: int = 256
+    ) -> Tuple[List[int], List[List[int]], List[Tuple[int, int]], int]:
+        """
+        Tokenize the text once and split it into overlapping windows.
+        Requires the RoBERTa tokenizer (call _load_roberta_model first).
+        
+        Args:
+            text: Input text
+            window_size: Tokens per window, including special tokens (max 512)
+            stride: Token offset between consecutive windows
+            
+        Returns:
+            Tuple of (window start tokens, window input ids with special
+            tokens, character offsets per token, token count)
+        """
+        tokenizer = self.roberta_tokenizer
+        encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        token_ids = encoding['input_ids']
+        offsets = [tuple(offset) for offset in encoding['offset_mapping']]
+        
+        if not token_ids:
+            return [], [], [], 0
+        
+        # Reserve room for <s> and </s> in every window
+        content_size = window_size - 2
+        last_start = max(len(token_ids) - content_size, 0)
+        starts = list(range(0, last_start + 1, stride))
+        if starts[-1] != last_start:
+            starts.append(last_start)  # Make sure the tail is covered
+        
+        windows = [
+            tokenizer.build_inputs_with_special_tokens(token_ids[start:start + content_size])
+            for start in starts
+        ]
+        return starts, windows, offsets, len(token_ids)
+    
+    def roberta_classify_ids(self, windows: List[List[int]], batch_size: int = 8) -> List[float]:
+        """
+        Classify tokenized windows (from roberta_windows) with padded batched
+        forward passes.
+        
+        Args:
+            windows: Input ids per window, special tokens included
+            batch_size: Number of windows per forward pass
+            
+        Returns:
+            Probability that each window is AI-generated (0-1)
+        """
+        self._load_roberta_model()
+        
+        if not self._model_loaded or self.roberta_model is None:
+            return [0.5] * len(windows)  # Neutral if model not available
+        
+        probabilities = []
+        for start in range(0, len(windows), batch_size):
+            inputs = self.roberta_tokenizer.pad(
+                {'input_ids': windows[start:start + batch_size]},
+                return_tensors="pt"
+            )
+            with tracer.start_as_current_span("roberta.forward") as span, torch.no_grad():
+                span.set_attribute("batch_size", inputs["input_ids"].shape[0])
+                span.set_attribute("seq_len", inputs["input_ids"].shape[1])
+                logits = self.roberta_model(**inputs).logits
+                probs = torch.softmax(logits, dim=1)
+            probabilities.extend(probs[:, 1].tolist())
+        
+        return probabilities
+    
+    @staticmethod
+    def window_heatmap(
+        starts: List[int],
+        probabilities: List[float],
+        offsets: List[Tuple[int, int]],
+        token_count: int,
+        window_size: int = 512
+    ) -> Tuple[float, List[Dict]]:
+        """
+        Per-window heatmap and length-weighted document probability.
+        Windows without a probability (cut off by a deadline) are left out.
+        
+        Returns:
+            Tuple of (document_probability, per-window heatmap)
+        """
+        content_size = window_size - 2
+        heatmap = []
+        weighted_sum = 0.0
+        total_tokens = 0
+        for start, probability in zip(starts, probabilities):
+            end = min(start + content_size, token_count)
+            heatmap.append({
+                'start_token': start,
+                'end_token': end,
+                'start_char': offsets[start][0],
+                'end_char': offsets[end - 1][1],
+                'probability': round(probability, 3)
+            })
+            # Weight windows by length so a short tail window cannot dominate
+            weighted_sum += probability * (end - start)
+            total_tokens += end - start
+        
+        if not total_tokens:
+            return 0.5, []
+        return weighted_sum / total_tokens, heatmap
+    
+    def roberta_classify_windows(
+        self,
+        text: str,
+        window_size: int = 512,
+        stride: int = 256,
+        batch_size: int = 8,
+        deadline: Optional[float] = None
+    ) -> Tuple[float, List[Dict]]:
+        """
+        Classify the full document with overlapping RoBERTa windows.
+        The text is tokenized once, split into overlapping windows and the
+        windows are run through the model in padded batches (by the shared
+        inference server when one is configured).
+        
+        Args:
+            text: Input text
+            window_size: Tokens per window, including special tokens (max 512)
+            stride: Token offset between consecutive windows
+            batch_size: Number of windows per forward pass
+            deadline: Optional time.time() after which no further batch is
+                started; the heatmap then covers the leading windows only
+            
+        Returns:
+            Tuple of (document_probability, per-window heatmap)
+        """
+        try:
+            if self.inference_client is not None:
+                return self.inference_client.roberta_classify_windows(
+                    text, window_size, stride, batch_size, deadline
+                )
+            
+            self._load_roberta_model()
+            
+            if not self._model_loaded or self.roberta_model is None:
+                return 0.5, []  # Neutral if model not available
+            
+            starts, windows, offsets, token_count = self.roberta_windows(text, window_size, stride)
+            
+            probabilities = []
+            for i in range(0, len(windows), batch_size):
+                if i and deadline is not None and time.time() > deadline:
+                    break
+                probabilities.extend(self.roberta_classify_ids(windows[i:i + batch_size], batch_size))
+            
+            return self.window_heatmap(starts, probabilities, offsets, token_count, window_size)
             
         except Exception as e:
-            print(f"Error in RoBERTa classification: {e}")
-            return 0.5  # Neutral on error
+            print(f"Error in windowed RoBERTa classification: {e}")
+            return 0.5, []  # Neutral on error
     
-    def analyze_vocabulary_diversity(self, text: str) -> float:
+    def analyze_vocabulary_diversity(self, text: str, features: Optional[TextFeatures] = None) -> float:
         """
         Analyze vocabulary diversity (Type-Token Ratio).
         AI text often has higher vocabulary diversity.
         
         Args:
             text: Input text
+            features: Precomputed TextFeatures (extracted here when omitted)
             
         Returns:
             Diversity score (0-1, higher = more diverse)
         """
-        words = re.findall(r'\b\w+\b', text.lower())
+        features = features or self.extract_features(text)
         
-        if len(words) < 10:
+        if len(features.words) < 10:
             return 0.5
         
-        unique_words = len(set(words))
-        total_words = len(words)
+        unique_words = len(features.word_counts)
+        total_words = len(features.words)
         
         # Type-Token Ratio
         ttr = unique_words / total_words
@@ -249,12 +546,21 @@ class AIDetector:
         # Human typically has TTR 0.4-0.6
         return ttr
     
-    def detect_ai_comprehensive(self, text: str) -> Tuple[float, Dict[str, float]]:
+    def detect_ai_comprehensive(
+        self,
+        text: str,
+        roberta_score: Optional[float] = None,
+        use_roberta: bool = True
+    ) -> Tuple[float, Dict[str, float]]:
         """
         Comprehensive AI detection using all methods.
         
         Args:
             text: Input text
+            roberta_score: Precomputed RoBERTa probability (e.g. from
+                roberta_classify_windows); classified here when omitted
+            use_roberta: False skips RoBERTa; the heuristic scores are then
+                reweighted to sum to one and 'roberta' is left out of the scores
             
         Returns:
             Tuple of (overall_ai_probability, individual_scores)
@@ -268,11 +574,12 @@ class AIDetector:
                 'vocabulary': 0.0
             }
         
-        # Calculate all metrics
-        perplexity = self.calculate_perplexity(text)
-        burstiness = self.calculate_burstiness(text)
-        patterns = self.detect_ai_patterns(text)
-        vocabulary = self.analyze_vocabulary_diversity(text)
+        # Calculate all metrics from one shared tokenization pass
+        features = self.extract_features(text)
+        perplexity = self.calculate_perplexity(text, features)
+        burstiness = self.calculate_burstiness(text, features)
+        patterns = self.detect_ai_patterns(text, features)
+        vocabulary = self.analyze_vocabulary_diversity(text, features)
         
         # Perplexity score (invert: lower perplexity = higher AI probability)
         perplexity_score = max(0, (100 - perplexity) / 100)
@@ -286,18 +593,27 @@ class AIDetector:
         # Vocabulary score (higher diversity = higher AI probability)
         vocab_score = vocabulary
         
+        weights = self.WEIGHTS
+        
+        if not use_roberta:
+            heuristic_weight = 1 - weights['roberta']
+            overall_score = (
+                perplexity_score * weights['perplexity'] +
+                burstiness_score * weights['burstiness'] +
+                pattern_score * weights['patterns'] +
+                vocab_score * weights['vocabulary']
+            ) / heuristic_weight if heuristic_weight else 0.0
+            
+            return round(overall_score, 3), {
+                'perplexity': round(perplexity_score, 3),
+                'burstiness': round(burstiness_score, 3),
+                'patterns': round(pattern_score, 3),
+                'vocabulary': round(vocab_score, 3)
+            }
+        
         # RoBERTa score (if available)
-        roberta_score = self.roberta_classify(text)
-        
-        # Weighted combination
-        # RoBERTa gets highest weight as it's most accurate
-        weights = {
-            'perplexity': 0.15,
-            'burstiness': 0.15,
-            'patterns': 0.15,
-            'vocabulary': 0.15,
-            'roberta': 0.40  # Highest weight for deep learning model
-        }
+        if roberta_score is None:
+            roberta_score = self.roberta_classify(text)
         
         overall_score = (
             perplexity_score * weights['perplexity'] +
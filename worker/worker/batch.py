@@ -0,0 +1,146 @@
+"""
+Vectorized scoring of a batch of documents against the reference corpus.
+
+A single upload scores the corpus one document pair at a time. A batch is
+scored as a query matrix instead, with the corpus side built once per corpus
+snapshot and reused by every batch:
+
+- cosine / lexical: hashed character / word n-gram TF-IDF with corpus IDF;
+  one sparse (batch x features) @ (features x corpus) product each
+- semantic: cached corpus embeddings; one dense matrix product
+- ngram: rapidfuzz cdist over all (query, reference) pairs, multithreaded
+
+Semantic and ngram scores equal the pairwise scores. The TF-IDF scores use
+IDF fitted on the whole corpus rather than on each pair, so they differ
+slightly from SimilarityDetector.cosine/lexical_similarity_score.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from opentelemetry import trace
+
+tracer = trace.get_tracer(__name__)
+
+# Hashed feature space; fixed memory regardless of corpus vocabulary
+N_FEATURES = 2 ** 20
+
+
+class CorpusIndex:
+    """Corpus-side matrices for scoring many queries at once."""
+
+    def __init__(self, detector, corpus_texts: List[str], n_features: int = N_FEATURES, workers: int = 1):
+        """
+        Fit the TF-IDF models on the corpus.
+
+        Args:
+            detector: SimilarityDetector (embeddings, weights)
+            corpus_texts: Normalized reference texts
+            n_features: Size of the hashed n-gram feature space
+            workers: Threads for the fuzzy n-gram matrix (this process's share
+                of the core budget)
+        """
+        self.detector = detector
+        self.corpus_texts = corpus_texts
+        self.workers = max(1, workers)
+        self._embeddings = None
+
+        # Same analyzers as the pairwise scorers
+        self.char_hasher = HashingVectorizer(
+            analyzer='char', ngram_range=(3, 5), n_features=n_features,
+            alternate_sign=False, norm=None
+        )
+        self.word_hasher = HashingVectorizer(
+            analyzer='word', ngram_range=(1, 3), n_features=n_features,
+            alternate_sign=False, norm=None, token_pattern=r'\b\w+\b'
+        )
+        self.char_tfidf = TfidfTransformer()
+        self.word_tfidf = TfidfTransformer()
+
+        with tracer.start_as_current_span("batch.corpus_index") as span:
+            span.set_attribute("corpus_size", len(corpus_texts))
+            if corpus_texts:
+                self.char_matrix = self.char_tfidf.fit_transform(self.char_hasher.transform(corpus_texts))
+                self.word_matrix = self.word_tfidf.fit_transform(self.word_hasher.transform(corpus_texts))
+
+    def _corpus_embeddings(self) -> np.ndarray:
+        """Unit-length corpus embeddings, encoded on first use."""
+        if self._embeddings is None:
+            if self.detector.inference_client is not None:
+                embeddings = np.asarray(self.detector.inference_client.encode(self.corpus_texts))
+            else:
+                embeddings = self.detector.encode(self.corpus_texts)
+            self._embeddings = _unit_rows(embeddings)
+        return self._embeddings
+
+    def cosine_matrix(self, queries: List[str]) -> np.ndarray:
+        """Character n-gram TF-IDF cosine similarity (queries x corpus)."""
+        query_matrix = self.char_tfidf.transform(self.char_hasher.transform(queries))
+        return (query_matrix @ self.char_matrix.T).toarray()
+
+    def lexical_matrix(self, queries: List[str]) -> np.ndarray:
+        """Word n-gram TF-IDF cosine similarity (queries x corpus)."""
+        query_matrix = self.word_tfidf.transform(self.word_hasher.transform(queries))
+        return (query_matrix @ self.word_matrix.T).toarray()
+
+    def ngram_matrix(self, queries: List[str]) -> np.ndarray:
+        """Same combination of fuzzy ratios as ngram_similarity_score, for all pairs."""
+        partial = process.cdist(queries, self.corpus_texts, scorer=fuzz.partial_ratio, workers=self.workers)
+        token = process.cdist(queries, self.corpus_texts, scorer=fuzz.token_sort_ratio, workers=self.workers)
+        return partial / 100.0 * 0.6 + token / 100.0 * 0.4
+
+    def semantic_matrix(self, queries: List[str]) -> np.ndarray:
+        """Embedding cosine similarity (queries x corpus)."""
+        if self.detector.inference_client is not None:
+            query_embeddings = np.asarray(self.detector.inference_client.encode(queries))
+        else:
+            query_embeddings = self.detector.encode(queries)
+        return _unit_rows(query_embeddings) @ self._corpus_embeddings().T
+
+    def similarity(
+        self,
+        queries: List[str],
+        weights: Optional[Dict[str, float]] = None
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Weighted combined similarity of every query against every reference.
+
+        Args:
+            queries: Normalized query texts
+            weights: Scorer weights (SimilarityDetector.DEFAULT_WEIGHTS by default);
+                scorers with weight 0 are not computed
+
+        Returns:
+            Tuple of (overall matrix, {scorer: matrix}), each queries x corpus
+        """
+        weights = weights or self.detector.DEFAULT_WEIGHTS
+        shape = (len(queries), len(self.corpus_texts))
+        scorers = {
+            'cosine': self.cosine_matrix,
+            'ngram': self.ngram_matrix,
+            'lexical': self.lexical_matrix,
+            'semantic': self.semantic_matrix,
+        }
+
+        matrices = {}
+        for name, scorer in scorers.items():
+            if not weights.get(name) or not queries or not self.corpus_texts:
+                matrices[name] = np.zeros(shape)
+                continue
+            try:
+                with tracer.start_as_current_span(f"batch.{name}") as span:
+                    span.set_attribute("queries", len(queries))
+                    matrices[name] = np.asarray(scorer(queries), dtype=float)
+            except Exception as e:
+                print(f"Error in batch {name} scoring: {e}")
+                matrices[name] = np.zeros(shape)
+
+        overall = sum(matrices[name] * weights.get(name, 0.0) for name in scorers)
+        return overall, matrices
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -0,0 +1,129 @@
+"""
+Claim-check blob store for large job inputs, stage texts and results.
+
+Pasted texts, the texts handed to canvas stage tasks and job results above a
+size threshold are written to a blob store; only a reference travels through
+the Redis broker and result backend. Smaller values stay inline.
+
+References are URLs, so any process can resolve them whatever its own store:
+    file:///<dir>/<key>       local directory (API and workers on one host or a shared volume)
+    s3://<bucket>/<key>       S3 / MinIO
+
+A result replaced by a reference looks like (shared with backend/app/core/blobs.py):
+    {"result_ref": "<url>", "size": <bytes>}
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+RESULT_REF = "result_ref"
+
+
+class BlobStore:
+    """Local-directory or S3 blob store with an inline-size threshold."""
+
+    def __init__(
+        self,
+        store: str = "local",
+        directory: str = "/tmp/plagiarism-blobs",
+        threshold_bytes: int = 64 * 1024,
+        s3_config: Optional[Dict] = None
+    ):
+        """
+        Args:
+            store: "local", "s3" or "none" (always inline)
+            directory: Root directory of the local store
+            threshold_bytes: Values up to this size stay inline
+            s3_config: endpoint, access_key, secret_key, bucket, region, use_ssl
+        """
+        self.store = store
+        self.directory = Path(directory)
+        self.threshold_bytes = threshold_bytes
+        self.s3_config = s3_config or {}
+        self._s3 = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.store in ("local", "s3")
+
+    def _s3_client(self):
+        if self._s3 is None:
+            import boto3
+            self._s3 = boto3.client(
+                "s3",
+                endpoint_url=self.s3_config.get("endpoint"),
+                aws_access_key_id=self.s3_config.get("access_key"),
+                aws_secret_access_key=self.s3_config.get("secret_key"),
+                region_name=self.s3_config.get("region"),
+                use_ssl=self.s3_config.get("use_ssl", False),
+            )
+        return self._s3
+
+    def put(self, key: str, data: bytes) -> str:
+        """Store `data` under `key`; returns its reference."""
+        if self.store == "s3":
+            bucket = self.s3_config["bucket"]
+            self._s3_client().put_object(Bucket=bucket, Key=key, Body=data)
+            return f"s3://{bucket}/{key}"
+        path = self.directory / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Readers never see a partly written blob
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return path.as_uri()
+
+    def get(self, ref: str) -> bytes:
+        url = urlparse(ref)
+        if url.scheme == "s3":
+            return self._s3_client().get_object(Bucket=url.netloc, Key=url.path.lstrip("/"))["Body"].read()
+        if url.scheme == "file":
+            return Path(url2pathname(url.path)).read_bytes()
+        raise ValueError(f"Unsupported blob reference: {ref}")
+
+    def delete(self, ref: str):
+        """Remove a blob that is no longer needed (errors are only logged)."""
+        try:
+            url = urlparse(ref)
+            if url.scheme == "s3":
+                self._s3_client().delete_object(Bucket=url.netloc, Key=url.path.lstrip("/"))
+            elif url.scheme == "file":
+                Path(url2pathname(url.path)).unlink(missing_ok=True)
+        except Exception as e:
+            print(f"Warning: blob cleanup failed: {e}")
+
+    def offload_text(self, key: str, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Move a large text out of a message.
+
+        Returns:
+            Tuple of (inline text, reference); exactly one of them is set
+        """
+        data = text.encode("utf-8")
+        if not self.enabled or len(data) <= self.threshold_bytes:
+            return text, None
+        try:
+            return None, self.put(key, data)
+        except Exception as e:
+            print(f"Warning: text offload failed: {e}")
+            return text, None
+
+    def get_text(self, ref: str) -> str:
+        return self.get(ref).decode("utf-8")
+
+    def offload_result(self, key: str, result: Any) -> Any:
+        """Result to return from a task: itself, or a reference to its JSON when large."""
+        if not self.enabled:
+            return result
+        data = json.dumps(result).encode("utf-8")
+        if len(data) <= self.threshold_bytes:
+            return result
+        try:
+            return {RESULT_REF: self.put(key, data), "size": len(data)}
+        except Exception as e:
+            # Inline is slower but still correct
+            print(f"Warning: result offload failed: {e}")
+            return result
@@ -0,0 +1,62 @@
+"""
+Wall-clock time budget for anytime analysis.
+
+A job submitted with a budget returns a less thorough result on time rather
+than a complete one late. Stages run in value order and check the budget
+between units of work (reference documents, RoBERTa batches, paragraphs);
+work that no longer fits is skipped or downscaled and noted, and the result
+is marked `partial` with the list of skipped steps.
+
+Usage:
+    budget = TimeBudget(800, start_time)      # 800 ms for the whole job
+    stage_budget = budget.allot(0.4)          # 40% of what is left, from now
+    if stage_budget.expired():
+        stage_budget.note("similarity.semantic", "not run")
+"""
+import time
+from typing import Dict, Optional
+
+
+class TimeBudget:
+    """Deadline of a job or stage plus notes on the work cut to meet it."""
+
+    def __init__(self, budget_ms: Optional[float], start_time: Optional[float] = None):
+        """
+        Args:
+            budget_ms: Milliseconds available; None or <= 0 means unlimited
+            start_time: time.time() the budget counts from (default: now)
+        """
+        self.start_time = time.time() if start_time is None else start_time
+        self.budget_ms = budget_ms if budget_ms and budget_ms > 0 else None
+        self.notes: Dict[str, str] = {}
+
+    @property
+    def limited(self) -> bool:
+        return self.budget_ms is not None
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """time.time() at which the budget runs out (None when unlimited)."""
+        if self.budget_ms is None:
+            return None
+        return self.start_time + self.budget_ms / 1000.0
+
+    def remaining_ms(self) -> float:
+        if self.budget_ms is None:
+            return float("inf")
+        return max(0.0, (self.deadline - time.time()) * 1000)
+
+    def expired(self) -> bool:
+        return self.budget_ms is not None and time.time() >= self.deadline
+
+    def allot(self, share: float) -> "TimeBudget":
+        """Budget for the next stage: `share` of the remaining time, starting now."""
+        allotted = TimeBudget(None)
+        if self.budget_ms is not None:
+            # May be 0 (already expired), unlike a budget given by the caller
+            allotted.budget_ms = self.remaining_ms() * share
+        return allotted
+
+    def note(self, step: str, detail: str):
+        """Record work that was skipped or downscaled."""
+        self.notes[step] = detail
@@ -0,0 +1,134 @@
+"""
+Content-hash result cache for identical resubmissions.
+Results are keyed by sha256 of the normalized text plus a configuration
+fingerprint (corpus snapshot version, scoring weights, model names), stored in
+Redis with a TTL and bounded by a maximum number of entries.
+
+Key layout (shared with backend/app/core/result_cache.py):
+    <prefix>:fingerprint              current worker configuration fingerprint
+    <prefix>:result:<digest>          cached result JSON
+    <prefix>:raw:<fingerprint>:<sha>  raw upload sha256 -> result key
+    <prefix>:index                    sorted set of result keys by insert time
+"""
+import json
+import time
+import hashlib
+from typing import Dict, Optional
+
+# Result fields that describe the job rather than the text (shared with
+# backend/app/core/result_cache.py): never stored, a cache hit fills in its own
+JOB_FIELDS = ("doc_id", "title", "incremental", "budget")
+
+
+def shareable(result: Dict) -> Dict:
+    """Result without the fields of the job that produced it."""
+    return {key: value for key, value in result.items() if key not in JOB_FIELDS}
+
+
+class ResultCache:
+    """Redis-backed result cache with TTL and size-based eviction."""
+
+    def __init__(
+        self,
+        redis_client,
+        ttl_seconds: int = 86400,
+        max_entries: int = 10000,
+        prefix: str = "plagcache"
+    ):
+        """
+        Args:
+            redis_client: redis.Redis instance
+            ttl_seconds: Lifetime of a cached result
+            max_entries: Maximum cached results; oldest are evicted first
+            prefix: Key namespace
+        """
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.prefix = prefix
+
+    @staticmethod
+    def fingerprint(**config) -> str:
+        """
+        Hash everything besides the text that influences a result.
+
+        Args:
+            config: JSON-serializable configuration (corpus version, weights, models, ...)
+
+        Returns:
+            Short hex fingerprint
+        """
+        encoded = json.dumps(config, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    def result_key(self, normalized_text: str, fingerprint: str) -> str:
+        """Cache key for a normalized text under a configuration fingerprint."""
+        digest = hashlib.sha256()
+        digest.update(fingerprint.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(normalized_text.encode('utf-8'))
+        return f"{self.prefix}:result:{digest.hexdigest()}"
+
+    def raw_key(self, content_sha256: str, fingerprint: str) -> str:
+        """Alias key from the raw upload hash to the result key."""
+        return f"{self.prefix}:raw:{fingerprint}:{content_sha256}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Fetch a cached result.
+
+        Returns:
+            Cached result, or None on miss or when Redis is unavailable
+        """
+        try:
+            cached = self.redis.get(key)
+            # Entries written before JOB_FIELDS existed may still carry them
+            return shareable(json.loads(cached)) if cached else None
+        except Exception as e:
+            print(f"Warning: result cache lookup failed: {e}")
+            return None
+
+    def link_raw(self, key: str, content_sha256: str, fingerprint: str):
+        """Point a raw upload hash at an existing result key."""
+        try:
+            self.redis.setex(self.raw_key(content_sha256, fingerprint), self.ttl_seconds, key)
+        except Exception as e:
+            print(f"Warning: result cache link failed: {e}")
+
+    def put(
+        self,
+        key: str,
+        result: Dict,
+        fingerprint: str,
+        content_sha256: Optional[str] = None
+    ):
+        """
+        Store a result and evict the oldest entries beyond max_entries.
+
+        Args:
+            key: Result key from result_key()
+            result: JSON-serializable result (JOB_FIELDS are left out)
+            fingerprint: Configuration fingerprint (published for the API)
+            content_sha256: Raw upload hash, aliased to the result when given
+        """
+        now = time.time()
+        index_key = f"{self.prefix}:index"
+
+        try:
+            pipe = self.redis.pipeline()
+            pipe.setex(key, self.ttl_seconds, json.dumps(shareable(result)))
+            pipe.set(f"{self.prefix}:fingerprint", fingerprint)
+            if content_sha256:
+                pipe.setex(self.raw_key(content_sha256, fingerprint), self.ttl_seconds, key)
+            pipe.zadd(index_key, {key: now})
+            # Expired entries leave the index; the TTL already dropped their values
+            pipe.zremrangebyscore(index_key, '-inf', now - self.ttl_seconds)
+            pipe.zcard(index_key)
+            size = pipe.execute()[-1]
+
+            if size > self.max_entries:
+                evicted = self.redis.zpopmin(index_key, size - self.max_entries)
+                if evicted:
+                    self.redis.delete(*[member for member, _ in evicted])
+        except Exception as e:
+            print(f"Warning: result cache store failed: {e}")
@@ -0,0 +1,240 @@
+"""
+Cohort (batch-internal) collusion detection.
+Compares a set of submissions against each other without scoring all N² pairs.
+
+Pipeline:
+1. MinHash signatures over word shingles of every document
+2. LSH banding to generate candidate pairs (near-linear in cohort size)
+3. Full multi-algorithm scoring on candidate pairs only
+4. Union-find clustering of suspicious pairs
+"""
+import zlib
+from itertools import combinations
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+# Mersenne prime 2^31 - 1 keeps (a * x + b) inside uint64 without overflow
+_PRIME = np.uint64((1 << 31) - 1)
+_CHUNK = 4096
+
+
+class MinHasher:
+    """
+    MinHash signatures over hashed word shingles.
+    Estimated Jaccard similarity is the fraction of equal signature slots.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """
+        Initialize the hash family.
+
+        Args:
+            num_perm: Number of hash permutations (signature length)
+            shingle_size: Number of consecutive words per shingle
+            seed: Seed for the permutation coefficients (keeps signatures comparable)
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=num_perm).astype(np.uint64)
+
+    def shingles(self, text: str) -> Set[int]:
+        """Hash word shingles of the text into 32-bit integers."""
+        words = text.split()
+        k = self.shingle_size
+
+        if len(words) < k:
+            grams = [' '.join(words)] if words else []
+        else:
+            grams = [' '.join(words[i:i + k]) for i in range(len(words) - k + 1)]
+
+        return {zlib.crc32(g.encode('utf-8')) for g in grams}
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Normalized input text
+
+        Returns:
+            Array of num_perm uint64 values
+        """
+        signature = np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        hashes = np.fromiter(self.shingles(text), dtype=np.uint64) % _PRIME
+
+        # Process shingles in chunks to bound the (num_perm x chunk) matrix
+        for start in range(0, len(hashes), _CHUNK):
+            chunk = hashes[start:start + _CHUNK]
+            permuted = (self._a[:, None] * chunk[None, :] + self._b[:, None]) % _PRIME
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+
+        return signature
+
+    @staticmethod
+    def jaccard(sig1: np.ndarray, sig2: np.ndarray) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        return float(np.mean(sig1 == sig2))
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing over MinHash signatures (banding technique).
+    Documents sharing at least one identical band become candidate pairs.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        """
+        Args:
+            num_perm: Signature length (must be divisible by bands)
+            bands: Number of bands; more bands = lower similarity threshold
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    def add(self, key: str, signature: np.ndarray):
+        """Insert a document signature into every band bucket."""
+        for band, bucket in enumerate(self._buckets):
+            start = band * self.rows
+            bucket[signature[start:start + self.rows].tobytes()].append(key)
+
+    def query(self, signature: np.ndarray) -> Set[str]:
+        """Return keys sharing at least one band with the signature."""
+        matches = set()
+        for band, bucket in enumerate(self._buckets):
+            start = band * self.rows
+            matches.update(bucket.get(signature[start:start + self.rows].tobytes(), []))
+        return matches
+
+    def candidate_pairs(self) -> Set[Tuple[str, str]]:
+        """Return all unordered key pairs that collide in any band."""
+        pairs = set()
+        for bucket in self._buckets:
+            for keys in bucket.values():
+                if len(keys) > 1:
+                    for a, b in combinations(sorted(set(keys)), 2):
+                        pairs.add((a, b))
+        return pairs
+
+
+class CohortAnalyzer:
+    """
+    Pairwise similarity graph for a cohort of submissions.
+    Only LSH candidate pairs are sent to the full multi-algorithm scorer.
+    """
+
+    def __init__(
+        self,
+        detector,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 3,
+        candidate_threshold: float = 0.1
+    ):
+        """
+        Args:
+            detector: SimilarityDetector used to score candidate pairs
+            num_perm: MinHash signature length
+            bands: LSH bands (32 bands x 4 rows ~ 0.42 Jaccard at 50% recall)
+            shingle_size: Words per shingle
+            candidate_threshold: Minimum estimated Jaccard for a candidate to be scored
+        """
+        self.detector = detector
+        self.minhasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.candidate_threshold = candidate_threshold
+
+    def analyze(self, documents: List[Dict[str, str]], threshold: float = 0.5) -> Dict:
+        """
+        Build the similarity graph for a cohort.
+
+        Args:
+            documents: List of dicts with 'doc_id' and normalized 'text'
+            threshold: Minimum combined score for a pair to be reported
+
+        Returns:
+            Dictionary with suspicious 'pairs', 'clusters' and 'stats'
+        """
+        texts = {doc['doc_id']: doc['text'] for doc in documents}
+        signatures = {}
+        index = LSHIndex(num_perm=self.num_perm, bands=self.bands)
+
+        for doc_id, text in texts.items():
+            signatures[doc_id] = self.minhasher.signature(text)
+            index.add(doc_id, signatures[doc_id])
+
+        candidates = index.candidate_pairs()
+
+        pairs = []
+        compared = 0
+        for a, b in sorted(candidates):
+            estimate = MinHasher.jaccard(signatures[a], signatures[b])
+            if estimate < self.candidate_threshold:
+                continue
+
+            compared += 1
+            score, individual_scores = self.detector.combined_similarity_score(texts[a], texts[b])
+
+            if score >= threshold:
+                pairs.append({
+                    'documents': [a, b],
+                    'score': round(score, 3),
+                    'jaccard_estimate': round(estimate, 3),
+                    'explain': {k: round(v, 3) for k, v in individual_scores.items()}
+                })
+
+        pairs = sorted(pairs, key=lambda x: x['score'], reverse=True)
+        n = len(texts)
+
+        return {
+            'pairs': pairs,
+            'clusters': self._cluster(pairs),
+            'stats': {
+                'documents': n,
+                'total_pairs': n * (n - 1) // 2,
+                'candidate_pairs': len(candidates),
+                'compared_pairs': compared,
+            }
+        }
+
+    def _cluster(self, pairs: List[Dict]) -> List[Dict]:
+        """Group suspicious pairs into connected components (union-find)."""
+        parent = {}
+
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for pair in pairs:
+            a, b = pair['documents']
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        groups = defaultdict(lambda: {'documents': set(), 'pairs': 0, 'max_score': 0.0})
+        for pair in pairs:
+            group = groups[find(pair['documents'][0])]
+            group['documents'].update(pair['documents'])
+            group['pairs'] += 1
+            group['max_score'] = max(group['max_score'], pair['score'])
+
+        clusters = [
+            {
+                'documents': sorted(g['documents']),
+                'pairs': g['pairs'],
+                'max_score': g['max_score']
+            }
+            for g in groups.values()
+        ]
+        return sorted(clusters, key=lambda c: (c['max_score'], len(c['documents'])), reverse=True)
@@ -2,6 +2,7 @@
 Corpus management for plagiarism detection.
 Manages reference documents and sample databases.
 """
+import hashlib
 from typing import List, Dict
 
 
@@ -14,6 +15,7 @@ class CorpusManager:
     def __init__(self):
         """Initialize corpus with sample academic texts."""
         self.corpus = self._get_sample_corpus()
+        self._version = None
     
     def _get_sample_corpus(self) -> List[Dict[str, str]]:
         """
@@ -123,6 +125,21 @@ class CorpusManager:
             }
         ]
     
+    def snapshot_version(self) -> str:
+        """
+        Content hash of the current corpus snapshot.
+        Changes whenever a reference document is added, removed or edited.
+        """
+        if self._version is None:
+            digest = hashlib.sha256()
+            for doc in self.corpus:
+                digest.update(doc['id'].encode('utf-8'))
+                digest.update(b'\0')
+                digest.update(doc['text'].encode('utf-8'))
+                digest.update(b'\0')
+            self._version = digest.hexdigest()[:16]
+        return self._version
+    
     def get_all_texts(self) -> List[str]:
         """Get all corpus texts for comparison."""
         return [doc['text'] for doc in self.corpus]
@@ -0,0 +1,426 @@
+"""
+Node-local inference server with dynamic micro-batching.
+One process per node owns the RoBERTa and sentence-transformer models and
+serves every Celery worker child over a Unix socket.
+
+Requests from all clients are queued per operation, grouped into dynamic
+batches (bounded by max batch size and max wait time), sorted by token length
+to minimize padding, and run through the model in a single batched call.
+
+Usage:
+    python -m worker.inference serve --socket /tmp/plagiarism-inference.sock
+    python -m worker.inference stats --socket /tmp/plagiarism-inference.sock
+
+Wire protocol: 4-byte big-endian length prefix followed by a JSON object.
+"""
+import os
+import json
+import time
+import socket
+import struct
+import asyncio
+import argparse
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_SOCKET = os.getenv("INFERENCE_SOCKET") or "/tmp/plagiarism-inference.sock"
+
+_HEADER = struct.Struct(">I")
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128]
+# Client-side allowance per RoBERTa window of a windowed classification
+# (estimated from the text length at ~4 characters per token)
+WINDOW_SECONDS = 2.0
+CHARS_PER_TOKEN = 4
+QUEUE_WAIT_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+
+class Histogram:
+    """Cumulative bucket histogram (Prometheus-style `le` buckets)."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict:
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets + ["+Inf"], self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {"buckets": cumulative, "count": self.count, "sum": round(self.sum, 3)}
+
+
+class _Batcher:
+    """
+    Dynamic batcher for one model operation.
+    Collects queued items until max_batch_size is reached or the oldest item
+    has waited max_wait_ms, then runs the batch on the model thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[List[str]], List],
+        token_length: Callable[[str], int],
+        executor: ThreadPoolExecutor,
+        max_batch_size: int,
+        max_wait_ms: float
+    ):
+        self.name = name
+        self.run_batch = run_batch
+        self.token_length = token_length
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+
+    async def submit(self, texts: List[str]) -> List:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            await self.queue.put((text, future, time.perf_counter()))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = items[0][2] + self.max_wait
+
+            while len(items) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            dispatched = time.perf_counter()
+            self.batch_sizes.observe(len(items))
+            for _, _, enqueued in items:
+                self.queue_wait_ms.observe((dispatched - enqueued) * 1000)
+
+            texts = [text for text, _, _ in items]
+
+            try:
+                results = await loop.run_in_executor(self.executor, self._process, texts)
+                for (_, future, _), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, future, _ in items:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process(self, texts: List[str]) -> List:
+        # Sort by token length so padded sub-batches contain similar lengths
+        order = sorted(range(len(texts)), key=lambda i: self.token_length(texts[i]))
+        sorted_results = self.run_batch([texts[i] for i in order])
+
+        results = [None] * len(texts)
+        for position, index in enumerate(order):
+            results[index] = sorted_results[position]
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            "pending": self.queue.qsize(),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+
+class InferenceServer:
+    """Unix-socket inference service shared by all worker children on a node."""
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0,
+        model_batch_size: int = 16,
+        ai_detector=None,
+        similarity_detector=None
+    ):
+        """
+        Args:
+            socket_path: Filesystem path of the Unix socket
+            max_batch_size: Maximum number of texts per dynamic batch
+            max_wait_ms: Maximum time the oldest request waits for a batch to fill
+            model_batch_size: Texts per forward pass inside a dynamic batch
+            ai_detector: AIDetector owning the RoBERTa model
+            similarity_detector: SimilarityDetector owning the sentence transformer
+        """
+        if ai_detector is None:
+            from worker.ai_detector import AIDetector
+            ai_detector = AIDetector()
+        if similarity_detector is None:
+            from worker.similarity import SimilarityDetector
+            similarity_detector = SimilarityDetector(
+                os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-mpnet-base-v2")
+            )
+
+        self.socket_path = socket_path
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.model_batch_size = model_batch_size
+        self.ai_detector = ai_detector
+        self.similarity_detector = similarity_detector
+        self.batchers: Dict[str, _Batcher] = {}
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def _roberta_length(self, text: str) -> int:
+        tokenizer = self.ai_detector.roberta_tokenizer
+        if tokenizer is None:
+            return len(text.split())
+        return len(tokenizer(text, truncation=True, max_length=512)["input_ids"])
+
+    def _semantic_length(self, text: str) -> int:
+        model = self.similarity_detector.semantic_model
+        if model is None:
+            return len(text.split())
+        return len(model.tokenizer(text, truncation=True)["input_ids"])
+
+    def _classify(self, texts: List[str]) -> List[float]:
+        return self.ai_detector.roberta_classify_batch(texts, batch_size=self.model_batch_size)
+
+    def _classify_ids(self, windows: List[List[int]]) -> List[float]:
+        return self.ai_detector.roberta_classify_ids(windows, batch_size=self.model_batch_size)
+
+    async def _classify_windows(self, request: Dict) -> List:
+        """
+        Windowed RoBERTa classification per text (AIDetector.roberta_classify_windows).
+        Windows go through their own batcher, so windows of concurrent
+        documents share forward passes.
+        """
+        loop = asyncio.get_running_loop()
+        window_size = request.get("window_size", 512)
+        stride = request.get("stride", 256)
+        batch_size = request.get("batch_size", 8)
+        deadline = request.get("deadline")
+
+        results = []
+        for text in request.get("texts", []):
+            if self.ai_detector.roberta_model is None:
+                results.append((0.5, []))  # Neutral if model not available
+                continue
+            # Tokenized on the model thread: the tokenizer is not shared across threads
+            starts, windows, offsets, token_count = await loop.run_in_executor(
+                self.executor, self.ai_detector.roberta_windows, text, window_size, stride
+            )
+            if deadline is None:
+                probabilities = await self.batchers["windows"].submit(windows)
+            else:
+                # No further windows once the caller's time budget is spent
+                probabilities = []
+                for i in range(0, len(windows), batch_size):
+                    if i and time.time() > deadline:
+                        break
+                    probabilities.extend(await self.batchers["windows"].submit(windows[i:i + batch_size]))
+            results.append(self.ai_detector.window_heatmap(starts, probabilities, offsets, token_count, window_size))
+        return results
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        embeddings = self.similarity_detector.encode(texts, batch_size=self.model_batch_size)
+        return embeddings.tolist()
+
+    def stats(self) -> Dict:
+        return {name: batcher.stats() for name, batcher in self.batchers.items()}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                request = json.loads(await reader.readexactly(_HEADER.unpack(header)[0]))
+
+                op = request.get("op")
+                try:
+                    if op == "stats":
+                        response = {"results": self.stats()}
+                    elif op == "classify_windows":
+                        response = {"results": await self._classify_windows(request)}
+                    elif op in self.batchers:
+                        response = {"results": await self.batchers[op].submit(request.get("texts", []))}
+                    else:
+                        response = {"error": f"Unknown op: {op}"}
+                except Exception as e:
+                    response = {"error": str(e)}
+
+                body = json.dumps(response).encode("utf-8")
+                writer.write(_HEADER.pack(len(body)) + body)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+
+        # Load models up front so the first request does not pay for it
+        await loop.run_in_executor(None, self.ai_detector._load_roberta_model)
+        await loop.run_in_executor(None, self.similarity_detector._load_semantic_model)
+
+        # One model thread: batches for the same op never run concurrently
+        executor = self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self.batchers = {
+            "classify": _Batcher("classify", self._classify, self._roberta_length,
+                                 executor, self.max_batch_size, self.max_wait_ms),
+            # Tokenized RoBERTa windows (classify_windows), sorted by token count
+            "windows": _Batcher("windows", self._classify_ids, len,
+                                executor, self.max_batch_size, self.max_wait_ms),
+            "encode": _Batcher("encode", self._encode, self._semantic_length,
+                               executor, self.max_batch_size, self.max_wait_ms),
+        }
+        for batcher in self.batchers.values():
+            loop.create_task(batcher.run())
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        print(f"Inference server listening on {self.socket_path}")
+
+        async with server:
+            await server.serve_forever()
+
+
+class InferenceClient:
+    """
+    Client shim used by worker children.
+    Mirrors the AIDetector / SimilarityDetector model methods.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        # Prefork children must not share the parent's connection
+        if self._sock is None or self._pid != os.getpid():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._sock, self._pid = sock, os.getpid()
+        return self._sock
+
+    def _recv_exactly(self, sock: socket.socket, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Inference server closed the connection")
+            data.extend(chunk)
+        return bytes(data)
+
+    def _call(self, op: str, texts: Optional[List[str]] = None, timeout: Optional[float] = None, **params):
+        body = json.dumps({"op": op, "texts": texts or [], **params}).encode("utf-8")
+        with self._lock:
+            try:
+                sock = self._connect()
+                sock.settimeout(timeout or self.timeout)
+                sock.sendall(_HEADER.pack(len(body)) + body)
+                size = _HEADER.unpack(self._recv_exactly(sock, _HEADER.size))[0]
+                response = json.loads(self._recv_exactly(sock, size))
+            except Exception:
+                self.close()
+                raise
+
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["results"]
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+    def roberta_classify_batch(self, texts: List[str]) -> List[float]:
+        return self._call("classify", texts)
+
+    def roberta_classify(self, text: str) -> float:
+        return self.roberta_classify_batch([text])[0]
+
+    def roberta_classify_windows(
+        self,
+        text: str,
+        window_size: int = 512,
+        stride: int = 256,
+        batch_size: int = 8,
+        deadline: Optional[float] = None
+    ) -> Tuple[float, List[Dict]]:
+        # Long documents have many windows: allow time for each of them
+        timeout = self.timeout + WINDOW_SECONDS * len(text) / (CHARS_PER_TOKEN * stride)
+        probability, heatmap = self._call(
+            "classify_windows",
+            [text],
+            timeout=timeout,
+            window_size=window_size,
+            stride=stride,
+            batch_size=batch_size,
+            deadline=deadline,
+        )[0]
+        return probability, heatmap
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self._call("encode", texts), dtype=np.float32)
+
+    def semantic_similarity_score(self, text1: str, text2: str) -> float:
+        if not text1 or not text2:
+            return 0.0
+        embeddings = self.encode([text1, text2])
+        norms = np.linalg.norm(embeddings, axis=1)
+        if not norms.all():
+            return 0.0
+        return float(embeddings[0] @ embeddings[1] / (norms[0] * norms[1]))
+
+    def stats(self) -> Dict:
+        return self._call("stats")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Node-local batched inference server")
+    parser.add_argument("command", choices=["serve", "stats"])
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--max-batch-size", type=int, default=int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32")))
+    parser.add_argument("--max-wait-ms", type=float, default=float(os.getenv("INFERENCE_MAX_WAIT_MS", "10")))
+    parser.add_argument("--model-batch-size", type=int, default=int(os.getenv("INFERENCE_MODEL_BATCH_SIZE", "16")))
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(json.dumps(InferenceClient(args.socket).stats(), indent=2))
+        return
+
+    server = InferenceServer(
+        socket_path=args.socket,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        model_batch_size=args.model_batch_size
+    )
+    asyncio.run(server.serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Prometheus metrics for the Celery worker.
+Works with the prefork pool through prometheus_client's multiprocess mode:
+every pool child writes its samples to files in PROMETHEUS_MULTIPROC_DIR and
+the parent serves the aggregate over HTTP.
+
+PROMETHEUS_MULTIPROC_DIR must be set in the environment before the worker
+starts (prometheus_client reads it at import time). Without it metrics stay
+per-process, which is enough for `--pool solo` and local testing.
+
+Usage:
+    PROMETHEUS_MULTIPROC_DIR=/tmp/plagiarism-metrics celery -A worker.app worker
+    curl localhost:9108/metrics
+    python -m worker.metrics            # print current samples without a server
+"""
+import os
+import time
+import shutil
+import functools
+from typing import Iterable
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+    REGISTRY,
+)
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SCORER_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+STAGE_SECONDS = Histogram(
+    "plagiarism_stage_seconds",
+    "Pipeline stage latency",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+SCORER_SECONDS = Histogram(
+    "plagiarism_scorer_seconds",
+    "Latency of individual scorer calls (the _count series is the call count)",
+    ["detector", "scorer"],
+    buckets=SCORER_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "plagiarism_cache_requests_total",
+    "Cache lookups by outcome (hit ratio = hit / (hit + miss))",
+    ["cache", "outcome"],
+)
+MODEL_LOAD_SECONDS = Gauge(
+    "plagiarism_model_load_seconds",
+    "Time taken to load a model",
+    ["model"],
+    multiprocess_mode="max",
+)
+DOCUMENTS_PROCESSED = Counter(
+    "plagiarism_documents_processed_total",
+    "Documents processed by outcome (documents/second = rate())",
+    ["status"],
+)
+
+QUEUE_WAIT_SECONDS = Histogram(
+    "plagiarism_queue_wait_seconds",
+    "Time from upload until a worker starts the job",
+    ["job_class"],
+    buckets=STAGE_BUCKETS,
+)
+DEADLINES = Counter(
+    "plagiarism_job_deadlines_total",
+    "Finished jobs by job class and whether they met their deadline",
+    ["job_class", "outcome"],
+)
+
+
+def observe_stage(stage: str, elapsed_ms: float):
+    STAGE_SECONDS.labels(stage).observe(elapsed_ms / 1000.0)
+
+
+def record_cache(cache: str, hit: bool, count: int = 1):
+    if count:
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc(count)
+
+
+def record_model_load(model: str, seconds: float):
+    MODEL_LOAD_SECONDS.labels(model).set(seconds)
+
+
+def record_document(status: str):
+    DOCUMENTS_PROCESSED.labels(status).inc()
+
+
+def observe_queue_wait(job_class: str, seconds: float):
+    QUEUE_WAIT_SECONDS.labels(job_class).observe(max(0.0, seconds))
+
+
+def record_deadline(job_class: str, met: bool):
+    DEADLINES.labels(job_class, "met" if met else "missed").inc()
+
+
+def instrument_scorers(component, detector_label: str, method_names: Iterable[str]):
+    """
+    Time selected scorer methods of a detector instance.
+    Wrappers are set on the instance, so internal self.<method>() calls
+    (e.g. from combined_similarity_score) are counted too.
+
+    Args:
+        component: SimilarityDetector / AIDetector instance
+        detector_label: Value of the `detector` label
+        method_names: Methods to time; each becomes a `scorer` label value
+    """
+    for name in method_names:
+        method = getattr(component, name)
+        observer = SCORER_SECONDS.labels(detector_label, name)
+
+        @functools.wraps(method)
+        def timed(*args, _method=method, _observer=observer, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                _observer.observe(time.perf_counter() - start)
+
+        setattr(component, name, timed)
+
+
+def instrument_model_load(component, method_name: str, model_label: str):
+    """
+    Record how long a lazy model loader takes the first time it loads.
+    Later calls return immediately and are not recorded.
+    """
+    method = getattr(component, method_name)
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        was_loaded = component._model_loaded
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        if not was_loaded and component._model_loaded:
+            record_model_load(model_label, time.perf_counter() - start)
+        return result
+
+    setattr(component, method_name, timed)
+
+
+def _registry():
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def reset_multiproc_dir():
+    """Remove samples left by a previous worker run (call before forking)."""
+    if MULTIPROC_DIR and os.path.isdir(MULTIPROC_DIR):
+        shutil.rmtree(MULTIPROC_DIR)
+    if MULTIPROC_DIR:
+        os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+
+def start_server(port: int):
+    """Serve aggregated metrics of all pool children on `port`."""
+    try:
+        start_http_server(port, registry=_registry())
+    except OSError as e:
+        print(f"Warning: could not start metrics server on port {port}: {e}")
+
+
+def mark_process_dead(pid: int):
+    """Drop live gauges of an exited pool child."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
+
+
+if __name__ == "__main__":
+    print(generate_latest(_registry()).decode("utf-8"))
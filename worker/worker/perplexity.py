@@ -0,0 +1,169 @@
+"""
+Language-model perplexity for AI detection.
+Scores text with a small local causal LM (distilgpt2 by default) using strided
+sliding-window evaluation, batched windows and a per-document token budget.
+"""
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+import torch
+from transformers import AutoTokenizer, AutoModelForCausalLM
+from opentelemetry import trace
+
+tracer = trace.get_tracer(__name__)
+
+
+class LMPerplexityScorer:
+    """
+    Strided, batched causal-LM perplexity with bounded cost per document.
+
+    Each window holds max_length tokens; only the tokens not already scored by
+    the previous window are counted, so every token is scored once with up to
+    (max_length - stride) tokens of left context. Documents longer than the
+    token budget are covered by evenly spaced sample windows instead.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "distilgpt2",
+        max_length: int = 512,
+        stride: int = 256,
+        batch_size: int = 8,
+        token_budget: int = 4096,
+        local_files_only: bool = True
+    ):
+        """
+        Args:
+            model_name: Causal LM name or path (loaded from the local HF cache)
+            max_length: Tokens per window (<= model context size)
+            stride: Newly scored tokens per window
+            batch_size: Windows per forward pass
+            token_budget: Maximum tokens fed to the model per document
+            local_files_only: Never download weights at runtime
+        """
+        self.model_name = model_name
+        self.max_length = max_length
+        self.stride = stride
+        self.batch_size = batch_size
+        self.token_budget = token_budget
+        self.local_files_only = local_files_only
+        self.model = None
+        self.tokenizer = None
+        self._model_loaded = False
+
+    def _load_model(self):
+        """Lazy load the causal language model."""
+        if not self._model_loaded:
+            try:
+                self.tokenizer = AutoTokenizer.from_pretrained(
+                    self.model_name,
+                    local_files_only=self.local_files_only
+                )
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    self.model_name,
+                    local_files_only=self.local_files_only
+                )
+                self.model.eval()
+                self._model_loaded = True
+            except Exception as e:
+                print(f"Warning: Could not load perplexity model {self.model_name}: {e}")
+                self._model_loaded = False
+
+    def _windows(self, num_tokens: int) -> List[Tuple[int, int, int]]:
+        """
+        Plan evaluation windows as (begin, end, first_scored_token).
+
+        Within budget: contiguous strided windows covering every token.
+        Over budget: evenly spaced windows, each scoring its last `stride` tokens.
+        """
+        if num_tokens <= self.max_length:
+            return [(0, num_tokens, 0)]
+
+        strided_cost = self.max_length * math.ceil((num_tokens - self.max_length) / self.stride + 1)
+
+        if strided_cost <= self.token_budget:
+            windows = []
+            prev_end = 0
+            for begin in range(0, num_tokens, self.stride):
+                end = min(begin + self.max_length, num_tokens)
+                windows.append((begin, end, prev_end))
+                prev_end = end
+                if end == num_tokens:
+                    break
+            return windows
+
+        # Sample windows evenly across the document so cost stays bounded
+        count = max(1, self.token_budget // self.max_length)
+        begins = np.linspace(0, num_tokens - self.max_length, count).astype(int)
+        return [
+            (int(begin), int(begin) + self.max_length, int(begin) + self.max_length - self.stride)
+            for begin in sorted(set(begins))
+        ]
+
+    def perplexity(self, text: str) -> Optional[float]:
+        """
+        Compute language-model perplexity of a text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Perplexity (lower = more predictable), or None if unavailable
+        """
+        try:
+            self._load_model()
+
+            if not self._model_loaded:
+                return None
+
+            token_ids = self.tokenizer(text)['input_ids']
+            if len(token_ids) < 2:
+                return None
+
+            pad_id = self.tokenizer.eos_token_id
+            windows = self._windows(len(token_ids))
+
+            total_nll = 0.0
+            total_tokens = 0
+
+            for i in range(0, len(windows), self.batch_size):
+                batch = windows[i:i + self.batch_size]
+                width = max(end - begin for begin, end, _ in batch)
+
+                input_ids = torch.full((len(batch), width), pad_id, dtype=torch.long)
+                attention_mask = torch.zeros((len(batch), width), dtype=torch.long)
+                labels = torch.full((len(batch), width), -100, dtype=torch.long)
+
+                for row, (begin, end, scored_from) in enumerate(batch):
+                    ids = torch.tensor(token_ids[begin:end], dtype=torch.long)
+                    input_ids[row, :len(ids)] = ids
+                    attention_mask[row, :len(ids)] = 1
+                    # Context tokens (already scored or sampled context) are masked out
+                    offset = scored_from - begin
+                    labels[row, offset:len(ids)] = ids[offset:]
+
+                with tracer.start_as_current_span("lm.forward") as span, torch.no_grad():
+                    span.set_attribute("batch_size", len(batch))
+                    span.set_attribute("seq_len", width)
+                    logits = self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+                # Token t is predicted from positions < t
+                shift_logits = logits[:, :-1, :].reshape(-1, logits.size(-1))
+                shift_labels = labels[:, 1:].reshape(-1)
+                total_nll += torch.nn.functional.cross_entropy(
+                    shift_logits,
+                    shift_labels,
+                    ignore_index=-100,
+                    reduction='sum'
+                ).item()
+                total_tokens += int((shift_labels != -100).sum())
+
+            if total_tokens == 0:
+                return None
+
+            return math.exp(total_nll / total_tokens)
+
+        except Exception as e:
+            print(f"Error in LM perplexity: {e}")
+            return None
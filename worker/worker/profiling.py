@@ -0,0 +1,96 @@
+"""
+On-demand profiling of single jobs.
+Runs one job under cProfile and stores the report in Redis next to the result,
+so slow production jobs can be inspected without reproducing them locally.
+
+Key layout (shared with backend/app/core/profiles.py):
+    <prefix>:<job_id>    JSON report (top functions, pstats text, raw pstats)
+"""
+import io
+import json
+import time
+import base64
+import marshal
+import pstats
+import cProfile
+from typing import Callable, Dict, List
+
+
+class JobProfiler:
+    """Deterministic per-job profiler with a Redis-backed report store."""
+
+    def __init__(
+        self,
+        redis_client,
+        ttl_seconds: int = 86400,
+        top_n: int = 50,
+        prefix: str = "plagprofile"
+    ):
+        """
+        Args:
+            redis_client: redis.Redis instance
+            ttl_seconds: Lifetime of stored reports
+            top_n: Functions listed in the report
+            prefix: Key namespace
+        """
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.top_n = top_n
+        self.prefix = prefix
+
+    def _top_functions(self, stats: pstats.Stats) -> List[Dict]:
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                "function": function,
+                "file": filename,
+                "line": line,
+                "calls": calls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            })
+        rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+        return rows[:self.top_n]
+
+    def report(self, profile: cProfile.Profile, wall_ms: int) -> Dict:
+        """
+        Build a JSON-serializable report from a finished profile.
+
+        Returns:
+            Report with top functions by cumulative time, the pstats text table
+            and the raw stats (base64 marshal, loadable with pstats.Stats)
+        """
+        profile.create_stats()
+        text = io.StringIO()
+        stats = pstats.Stats(profile, stream=text)
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+
+        return {
+            "profiler": "cProfile",
+            "wall_ms": wall_ms,
+            "functions": self._top_functions(stats),
+            "pstats_text": text.getvalue(),
+            "pstats_b64": base64.b64encode(marshal.dumps(profile.stats)).decode("ascii"),
+        }
+
+    def run(self, job_id: str, fn: Callable, *args, **kwargs):
+        """
+        Call fn under the profiler and store the report for job_id.
+
+        Returns:
+            Whatever fn returns
+        """
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.disable()
+            wall_ms = int((time.perf_counter() - start) * 1000)
+            try:
+                report = self.report(profile, wall_ms)
+                report["job_id"] = job_id
+                self.redis.setex(f"{self.prefix}:{job_id}", self.ttl_seconds, json.dumps(report))
+            except Exception as e:
+                print(f"Warning: storing profile for job {job_id} failed: {e}")
@@ -0,0 +1,136 @@
+"""
+Per-stage job progress.
+Every pipeline stage records its status, work done / total and elapsed time in
+one Redis hash per job. Canvas stages run as separate tasks and cannot share
+the job's Celery state without overwriting each other; hash fields can be
+written concurrently.
+
+Key layout (shared with backend/app/core/progress.py):
+    <prefix>:<job_id>              hash of <stage>:status | <stage>:done | <stage>:total | <stage>:ms
+    <prefix>:<job_id>:fragments    list of JSON fragment batches found so far
+
+Every write is also published as a JSON event on a pub/sub channel, together
+with job completions (publish_event), so the API can push updates to clients
+instead of being polled (backend/app/core/events.py):
+    {"job_id", "event": "progress", "stage", "status"?, "done", "total", "elapsed_ms"?}
+    {"job_id", "event": "fragments", "fragments": [...]}
+    {"job_id", "event": "done", "status"}
+"""
+import json
+import time
+from typing import Dict, List, Optional
+
+STAGES = ("extract", "normalize", "similarity", "ai", "fragments")
+
+
+class ProgressReporter:
+    """Writes progress of one job's stages; no-op without a job id."""
+
+    def __init__(
+        self,
+        redis_client,
+        job_id: Optional[str],
+        ttl_seconds: int = 3600,
+        prefix: str = "plagprogress",
+        channel: Optional[str] = "plagevents"
+    ):
+        """
+        Args:
+            redis_client: redis.Redis instance
+            job_id: Celery task id the API polls
+            ttl_seconds: Lifetime of the progress hash
+            prefix: Key namespace
+            channel: Pub/sub channel for progress events (None = do not publish)
+        """
+        self.redis = redis_client
+        self.job_id = job_id
+        self.ttl_seconds = ttl_seconds
+        self.key = f"{prefix}:{job_id}"
+        self.fragments_key = f"{self.key}:fragments"
+        self.channel = channel
+        self._started: Dict[str, float] = {}
+        self._totals: Dict[str, int] = {}
+        self._last_report: Dict[str, int] = {}
+
+    def _write(self, stage: str, fields: Dict):
+        if not self.job_id:
+            return
+        try:
+            # Hash update and event in one round trip
+            pipe = self.redis.pipeline()
+            pipe.hset(self.key, mapping={f"{stage}:{name}": value for name, value in fields.items()})
+            pipe.expire(self.key, self.ttl_seconds)
+            if self.channel:
+                event = {"elapsed_ms" if name == "ms" else name: value for name, value in fields.items()}
+                pipe.publish(self.channel, json.dumps({
+                    "job_id": self.job_id, "event": "progress", "stage": stage, **event
+                }))
+            pipe.execute()
+        except Exception as e:
+            print(f"Warning: progress update failed: {e}")
+
+    def start(self, stage: str, total: int = 1):
+        """Mark a stage as running with `total` units of work."""
+        self._started[stage] = time.perf_counter()
+        self._totals[stage] = total
+        self._last_report[stage] = 0
+        self._write(stage, {"status": "running", "done": 0, "total": total})
+
+    def advance(self, stage: str, done: int, total: int):
+        """
+        Report work done within a stage.
+        Throttled to roughly every 5% so tight loops do not flood Redis.
+        """
+        self._totals[stage] = total
+        step = max(1, total // 20)
+        if done < total and done - self._last_report.get(stage, 0) < step:
+            return
+        self._last_report[stage] = done
+        self._write(stage, {"done": done, "total": total, "ms": self.elapsed_ms(stage)})
+
+    def finish(self, stage: str, status: str = "done") -> int:
+        """
+        Mark a stage as finished.
+
+        Returns:
+            Elapsed milliseconds of the stage
+        """
+        elapsed = self.elapsed_ms(stage)
+        total = self._totals.get(stage, 1)
+        self._write(stage, {"status": status, "done": total, "total": total, "ms": elapsed})
+        return elapsed
+
+    def push_fragments(self, fragments: List[Dict]):
+        """Append matching fragments found so far (served before the job completes)."""
+        if not self.job_id or not fragments:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.rpush(self.fragments_key, json.dumps(fragments))
+            pipe.expire(self.fragments_key, self.ttl_seconds)
+            if self.channel:
+                pipe.publish(self.channel, json.dumps({
+                    "job_id": self.job_id, "event": "fragments", "fragments": fragments
+                }))
+            pipe.execute()
+        except Exception as e:
+            print(f"Warning: partial fragments update failed: {e}")
+
+    def elapsed_ms(self, stage: str) -> int:
+        started = self._started.get(stage)
+        if started is None:
+            return 0
+        return int((time.perf_counter() - started) * 1000)
+
+
+def publish_event(redis_client, channel: Optional[str], job_id: Optional[str], event: str, **fields):
+    """
+    Publish a job event other than stage progress (e.g. "done" once the
+    job's result is stored). No-op without a channel or job id.
+    """
+    if not channel or not job_id:
+        return
+    try:
+        redis_client.publish(channel, json.dumps({"job_id": job_id, "event": event, **fields}))
+    except Exception as e:
+        print(f"Warning: job event publish failed: {e}")
@@ -0,0 +1,221 @@
+"""
+Incremental re-check of revised drafts.
+Stores per-paragraph hashes and per-paragraph fragment matches for every
+checked document, finds the previous draft of a new submission (same user +
+title, or high MinHash overlap) and lets the pipeline re-score only the
+paragraphs that were added or changed.
+"""
+import re
+import json
+import hashlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from worker.cohort import MinHasher
+
+BLANK_LINE_RE = re.compile(r'\n\s*\n')
+SENTENCE_END_RE = re.compile(r'[.!?]["\')\]]*\s*$')
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """
+    Split raw text into paragraphs.
+    Blank lines delimit paragraphs; text without blank lines (typical for PDF
+    extraction) is cut after lines that end a sentence, so boundaries depend
+    on content rather than position and survive edits elsewhere.
+
+    Args:
+        text: Raw extracted text
+
+    Returns:
+        List of non-empty paragraphs
+    """
+    blocks = [b.strip() for b in BLANK_LINE_RE.split(text) if b.strip()]
+    if len(blocks) > 1:
+        return blocks
+
+    paragraphs = []
+    current = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        current.append(line)
+        if SENTENCE_END_RE.search(line):
+            paragraphs.append(' '.join(current))
+            current = []
+    if current:
+        paragraphs.append(' '.join(current))
+
+    return paragraphs
+
+
+def paragraph_hash(normalized_paragraph: str) -> str:
+    """Stable hash of a normalized paragraph."""
+    return hashlib.sha256(normalized_paragraph.encode('utf-8')).hexdigest()[:32]
+
+
+class RevisionStore:
+    """
+    Redis-backed store of per-paragraph match results keyed by document.
+
+    Key layout:
+        <prefix>:<fp>:doc:<doc_id>          paragraph hashes, matches, signature
+        <prefix>:<fp>:lineage:<user+title>  latest doc_id for a user + title
+        <prefix>:<fp>:lsh:<band>:<bucket>   doc_ids sharing a MinHash band
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        fingerprint: str,
+        ttl_seconds: int = 30 * 86400,
+        min_overlap: float = 0.5,
+        num_perm: int = 128,
+        bands: int = 32,
+        prefix: str = "plagrev"
+    ):
+        """
+        Args:
+            redis_client: redis.Redis instance
+            fingerprint: Configuration fingerprint; stored matches are only
+                reused under the same corpus, weights and models
+            ttl_seconds: Lifetime of stored revisions
+            min_overlap: Minimum estimated Jaccard to treat a submission as a revision
+            num_perm: MinHash signature length
+            bands: LSH bands for lineage lookup
+        """
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.min_overlap = min_overlap
+        self.minhasher = MinHasher(num_perm=num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.prefix = f"{prefix}:{fingerprint}"
+
+    def signature(self, normalized_text: str) -> np.ndarray:
+        return self.minhasher.signature(normalized_text)
+
+    def _lineage_key(self, user_id: Optional[str], title: Optional[str]) -> Optional[str]:
+        if not user_id or not title:
+            return None
+        digest = hashlib.sha256(f"{user_id}\0{title.strip().lower()}".encode('utf-8')).hexdigest()
+        return f"{self.prefix}:lineage:{digest[:32]}"
+
+    def _band_keys(self, signature: np.ndarray) -> List[str]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            keys.append(f"{self.prefix}:lsh:{band}:{hashlib.sha1(chunk).hexdigest()[:16]}")
+        return keys
+
+    def _load(self, doc_id: str) -> Optional[Dict]:
+        record = self.redis.get(f"{self.prefix}:doc:{doc_id}")
+        return json.loads(record) if record else None
+
+    def find_previous(
+        self,
+        user_id: Optional[str],
+        title: Optional[str],
+        signature: np.ndarray
+    ) -> Optional[Dict]:
+        """
+        Find the stored previous draft of a submission.
+        The MinHash fallback may return another user's document: its matches
+        can be reused, its doc_id must not be shown (see same_owner).
+
+        Returns:
+            Stored record with 'doc_id', 'user_id' and 'paragraphs' (hash -> matches), or None
+        """
+        try:
+            lineage_key = self._lineage_key(user_id, title)
+            if lineage_key:
+                doc_id = self.redis.get(lineage_key)
+                if doc_id:
+                    record = self._load(doc_id.decode() if isinstance(doc_id, bytes) else doc_id)
+                    if record:
+                        return record
+
+            # No explicit lineage: look for a near-duplicate via LSH buckets
+            return self.find_similar(signature)
+
+        except Exception as e:
+            print(f"Warning: revision lookup failed: {e}")
+            return None
+
+    @staticmethod
+    def same_owner(record: Dict, user_id: Optional[str]) -> bool:
+        """Whether a stored record was submitted by `user_id` (never for anonymous submissions)."""
+        return bool(user_id) and record.get('user_id') == user_id
+
+    def find_similar(self, signature: np.ndarray, min_overlap: Optional[float] = None) -> Optional[Dict]:
+        """
+        Stored document with the highest MinHash overlap (any user).
+
+        Args:
+            signature: MinHash signature of the normalized text
+            min_overlap: Minimum estimated Jaccard (default: the store's min_overlap)
+
+        Returns:
+            Stored record, or None below min_overlap
+        """
+        try:
+            pipe = self.redis.pipeline()
+            for key in self._band_keys(signature):
+                pipe.smembers(key)
+            candidates = set()
+            for members in pipe.execute():
+                candidates.update(m.decode() if isinstance(m, bytes) else m for m in members)
+
+            best = None
+            best_overlap = self.min_overlap if min_overlap is None else min_overlap
+            for doc_id in candidates:
+                record = self._load(doc_id)
+                if not record:
+                    continue
+                overlap = MinHasher.jaccard(signature, np.array(record['signature'], dtype=np.uint64))
+                if overlap >= best_overlap:
+                    best, best_overlap = record, overlap
+            return best
+
+        except Exception as e:
+            print(f"Warning: revision lookup failed: {e}")
+            return None
+
+    def save(
+        self,
+        doc_id: str,
+        user_id: Optional[str],
+        title: Optional[str],
+        signature: np.ndarray,
+        paragraphs: Dict[str, List[Dict]]
+    ):
+        """
+        Store per-paragraph matches of a checked document and index its lineage.
+
+        Args:
+            doc_id: Document id
+            user_id: Submitting user (lineage by user + title)
+            title: Document title
+            signature: MinHash signature of the normalized text
+            paragraphs: Paragraph hash -> fragment matches
+        """
+        record = {
+            'doc_id': doc_id,
+            'user_id': user_id,
+            'signature': signature.tolist(),
+            'paragraphs': paragraphs,
+        }
+        try:
+            pipe = self.redis.pipeline()
+            pipe.setex(f"{self.prefix}:doc:{doc_id}", self.ttl_seconds, json.dumps(record))
+            lineage_key = self._lineage_key(user_id, title)
+            if lineage_key:
+                pipe.setex(lineage_key, self.ttl_seconds, doc_id)
+            for key in self._band_keys(signature):
+                pipe.sadd(key, doc_id)
+                pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+        except Exception as e:
+            print(f"Warning: revision store failed: {e}")
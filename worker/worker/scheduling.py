@@ -0,0 +1,44 @@
+"""
+Deadline-based priorities for pipeline tasks.
+
+The API assigns every upload a job class, a class queue and a deadline
+(backend/app/core/scheduling.py). The Redis transport keeps one list per
+priority step and a worker pops step 0 of all its queues before step 1 of
+any queue, so mapping the time left until the deadline to a priority makes
+workers run earliest-deadline work first among the queues they consume.
+Stage tasks of a fanned-out job are re-prioritized from the time left when
+they are sent.
+
+The broker transport options must match on the API and the worker.
+"""
+import time
+from bisect import bisect_left
+from typing import Optional
+
+# Redis priorities: 0 is popped first
+PRIORITY_STEPS = list(range(10))
+# Upper bound (seconds until the deadline) of priority steps 0..8; 9 = beyond
+_SLACK_BOUNDS = (1, 5, 15, 60, 300, 900, 3600, 4 * 3600, 24 * 3600)
+
+BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": PRIORITY_STEPS,
+    # Equal priority: queues in -Q order (interactive first)
+    "queue_order_strategy": "priority",
+}
+
+
+def priority_for_deadline(deadline: Optional[float], now: Optional[float] = None) -> Optional[int]:
+    """
+    Broker priority step for the time left until `deadline`.
+
+    Args:
+        deadline: Epoch seconds, or None for jobs submitted without one
+        now: Current time (defaults to time.time())
+
+    Returns:
+        Priority step (0 = most urgent), or None to keep the default
+    """
+    if deadline is None:
+        return None
+    slack = deadline - (time.time() if now is None else now)
+    return bisect_left(_SLACK_BOUNDS, slack)
@@ -2,12 +2,18 @@
 Multi-algorithm similarity detection module.
 Implements state-of-the-art algorithms for plagiarism detection.
 """
-from typing import List, Tuple, Dict
+import contextvars
+from concurrent.futures import Executor
+import time
+from typing import Callable, List, Tuple, Dict, Iterable, Iterator, Optional
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from rapidfuzz import fuzz
 from sentence_transformers import SentenceTransformer
+from opentelemetry import trace
+
+tracer = trace.get_tracer(__name__)
 
 
 class SimilarityDetector:
@@ -16,16 +22,35 @@ class SimilarityDetector:
     Combines lexical, syntactic, and semantic approaches for optimal accuracy.
     """
     
-    def __init__(self, model_name: str = "sentence-transformers/all-mpnet-base-v2"):
+    # Default weights optimized for plagiarism detection
+    DEFAULT_WEIGHTS = {
+        'cosine': 0.25,    # Character-level matching
+        'ngram': 0.25,     # Fuzzy string matching
+        'lexical': 0.25,   # Word-level matching
+        'semantic': 0.25   # Meaning-based matching
+    }
+    
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-mpnet-base-v2",
+        inference_client=None,
+        executor: Optional[Executor] = None
+    ):
         """
         Initialize similarity detector with pre-trained models.
         
         Args:
             model_name: Name of the sentence transformer model
+            inference_client: Optional InferenceClient; when set, embeddings
+                are computed by the shared inference server
+            executor: Optional thread pool; when set, combined_similarity_score
+                runs the four scorers concurrently on it
         """
         self.semantic_model = None
         self.model_name = model_name
         self._model_loaded = False
+        self.inference_client = inference_client
+        self.executor = executor
     
     def _load_semantic_model(self):
         """Lazy load semantic model to save memory."""
@@ -57,7 +82,8 @@ class SimilarityDetector:
                 max_features=5000
             )
             
-            tfidf_matrix = vectorizer.fit_transform([text1, text2])
+            with tracer.start_as_current_span("tfidf.fit_transform"):
+                tfidf_matrix = vectorizer.fit_transform([text1, text2])
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
             
             return float(similarity)
@@ -118,7 +144,8 @@ class SimilarityDetector:
                 token_pattern=r'\b\w+\b'
             )
             
-            tfidf_matrix = vectorizer.fit_transform([text1, text2])
+            with tracer.start_as_current_span("tfidf.fit_transform"):
+                tfidf_matrix = vectorizer.fit_transform([text1, text2])
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
             
             return float(similarity)
@@ -143,28 +170,43 @@ class SimilarityDetector:
             return 0.0
         
         try:
-            # Load model on first use
-            self._load_semantic_model()
-            
-            # Generate embeddings
-            embeddings = self.semantic_model.encode([text1, text2], convert_to_tensor=True)
+            # Generate embeddings (locally or on the shared inference server)
+            if self.inference_client is not None:
+                embeddings = self.inference_client.encode([text1, text2])
+            else:
+                embeddings = self.encode([text1, text2])
             
             # Calculate cosine similarity
-            similarity = cosine_similarity(
-                embeddings[0:1].cpu().numpy(),
-                embeddings[1:2].cpu().numpy()
-            )[0][0]
+            similarity = cosine_similarity(embeddings[0:1], embeddings[1:2])[0][0]
             
             return float(similarity)
         except Exception as e:
             print(f"Error in semantic_similarity_score: {e}")
             return 0.0
     
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Encode texts into sentence embeddings in batches.
+        
+        Args:
+            texts: Input texts
+            batch_size: Number of texts per forward pass
+            
+        Returns:
+            Array of shape (len(texts), embedding_dim)
+        """
+        # Load model on first use
+        self._load_semantic_model()
+        with tracer.start_as_current_span("semantic.encode") as span:
+            span.set_attribute("texts", len(texts))
+            return self.semantic_model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    
     def combined_similarity_score(
         self,
         text1: str,
         text2: str,
-        weights: Dict[str, float] = None
+        weights: Dict[str, float] = None,
+        include: Optional[Iterable[str]] = None
     ) -> Tuple[float, Dict[str, float]]:
         """
         Calculate weighted combined similarity across all algorithms.
@@ -174,29 +216,43 @@ class SimilarityDetector:
             text1: First text
             text2: Second text
             weights: Optional custom weights for each algorithm
+            include: Optional subset of algorithms to run; the overall score
+                is then the weighted average over that subset
             
         Returns:
             Tuple of (overall_score, individual_scores)
         """
-        # Default weights optimized for plagiarism detection
         if weights is None:
-            weights = {
-                'cosine': 0.25,    # Character-level matching
-                'ngram': 0.25,     # Fuzzy string matching
-                'lexical': 0.25,   # Word-level matching
-                'semantic': 0.25   # Meaning-based matching
-            }
+            weights = self.DEFAULT_WEIGHTS
         
-        # Calculate all similarity scores
-        scores = {
-            'cosine': self.cosine_similarity_score(text1, text2),
-            'ngram': self.ngram_similarity_score(text1, text2),
-            'lexical': self.lexical_similarity_score(text1, text2),
-            'semantic': self.semantic_similarity_score(text1, text2)
+        scorers = {
+            'cosine': self.cosine_similarity_score,
+            'ngram': self.ngram_similarity_score,
+            'lexical': self.lexical_similarity_score,
+            'semantic': self.semantic_similarity_score
         }
+        if include is not None:
+            scorers = {name: scorers[name] for name in include}
+        
+        # Calculate all similarity scores
+        if self.executor is None:
+            scores = {name: scorer(text1, text2) for name, scorer in scorers.items()}
+        else:
+            # rapidfuzz, scipy sparse ops and torch release the GIL, so the
+            # pair costs about as much as its slowest scorer. Each call runs
+            # in a copy of the caller's context to keep trace spans nested.
+            futures = {
+                name: self.executor.submit(contextvars.copy_context().run, scorer, text1, text2)
+                for name, scorer in scorers.items()
+            }
+            scores = {name: future.result() for name, future in futures.items()}
         
         # Calculate weighted average
-        overall = sum(scores[k] * weights[k] for k in weights.keys())
+        if include is None:
+            overall = sum(scores[k] * weights[k] for k in weights.keys())
+        else:
+            total_weight = sum(weights[k] for k in scores)
+            overall = sum(scores[k] * weights[k] for k in scores) / total_weight if total_weight else 0.0
         
         return overall, scores
     
@@ -205,7 +261,9 @@ class SimilarityDetector:
         query_text: str,
         corpus_texts: List[str],
         threshold: float = 0.7,
-        fragment_size: int = 100
+        fragment_size: int = 100,
+        deadline: Optional[float] = None,
+        on_matches: Optional[Callable[[int, List[Dict]], None]] = None
     ) -> List[Dict]:
         """
         Find specific text fragments that match between query and corpus.
@@ -215,17 +273,53 @@ class SimilarityDetector:
             corpus_texts: List of reference texts
             threshold: Minimum similarity threshold
             fragment_size: Size of text fragments to compare
+            deadline: Optional time.time() after which no further reference
+                text is scanned (matches found so far are returned)
+            on_matches: Optional callback receiving (references scanned, new
+                matches) after each reference text, e.g. to publish partial results
             
         Returns:
             List of matching fragments with scores and sources
         """
         matches = []
+        scanned = self.iter_matching_fragments(
+            query_text, corpus_texts, threshold, fragment_size, deadline
+        )
+        for i, reference_matches in enumerate(scanned):
+            matches.extend(reference_matches)
+            if on_matches is not None:
+                on_matches(i + 1, reference_matches)
         
+        # Sort by score and remove duplicates
+        matches = sorted(matches, key=lambda x: x['score'], reverse=True)
+        return matches[:10]  # Return top 10 matches
+    
+    def iter_matching_fragments(
+        self,
+        query_text: str,
+        corpus_texts: List[str],
+        threshold: float = 0.7,
+        fragment_size: int = 100,
+        deadline: Optional[float] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Scan the corpus for matching fragments one reference text at a time.
+        
+        Args:
+            Same as find_matching_fragments
+            
+        Yields:
+            The (possibly empty) list of matches of each scanned reference text,
+            in corpus order, unsorted; stops early once `deadline` has passed
+        """
         # Split query into fragments (sentences or fixed-size chunks)
         query_sentences = self._split_into_fragments(query_text, fragment_size)
         
         for i, corpus_text in enumerate(corpus_texts):
+            if deadline is not None and time.time() > deadline:
+                return
             corpus_sentences = self._split_into_fragments(corpus_text, fragment_size)
+            matches = []
             
             for q_frag in query_sentences:
                 for c_frag in corpus_sentences:
@@ -243,10 +337,7 @@ class SimilarityDetector:
                                 'source': f"Source {i + 1}",
                                 'matched_text': c_frag
                             })
-        
-        # Sort by score and remove duplicates
-        matches = sorted(matches, key=lambda x: x['score'], reverse=True)
-        return matches[:10]  # Return top 10 matches
+            yield matches
     
     def _split_into_fragments(self, text: str, size: int) -> List[str]:
         """Split text into fragments of approximately equal size."""
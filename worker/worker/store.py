@@ -0,0 +1,190 @@
+"""
+Durable copy of job results in PostgreSQL.
+Results live in the Redis result backend only until it expires (or Redis
+restarts); the API reads persisted results from PostgreSQL first
+(backend/app/core/results_db.py), with one query per request.
+
+Rows written per job (tables from backend/alembic):
+    documents    the submitted document (user_id only when the user exists)
+    jobs         status, similarity, AI probability, summary JSON (the result without fragments)
+    fragments    the result's matching fragments, in rank order
+
+A job's rows are written in one transaction; many jobs (a batch) share it:
+documents and jobs as multi-row INSERTs, fragments with COPY.
+"""
+import csv
+import io
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Fragments as scored by the combined similarity score
+MATCH_TYPE = "combined"
+# Column lengths (backend/app/models.py); longer values are truncated so one
+# long filename or source title cannot fail the whole transaction
+TITLE_LENGTH = 512
+PATH_LENGTH = 1024
+
+
+def _clip(value: Optional[str], length: int) -> Optional[str]:
+    return value[:length] if isinstance(value, str) else value
+
+
+class ResultStore:
+    """Writes job results to PostgreSQL; failures are logged and skipped."""
+
+    def __init__(self, dsn: str, retry_seconds: float = 30.0, connect_timeout: int = 3):
+        """
+        Args:
+            dsn: PostgreSQL URL (SQLAlchemy "postgresql+psycopg2://" URLs are accepted)
+            retry_seconds: Pause before reconnecting after a failed connection
+            connect_timeout: Seconds to wait for a connection
+        """
+        self.dsn = dsn.replace("postgresql+psycopg2://", "postgresql://", 1)
+        self.retry_seconds = retry_seconds
+        self.connect_timeout = connect_timeout
+        self._conn = None
+        self._failed_at = 0.0
+
+    def _connection(self):
+        """Connection of this process, (re)opened lazily after fork or errors."""
+        if self._conn is not None and not self._conn.closed:
+            return self._conn
+        if time.time() - self._failed_at < self.retry_seconds:
+            return None
+        try:
+            import psycopg2
+            self._conn = psycopg2.connect(self.dsn, connect_timeout=self.connect_timeout)
+            return self._conn
+        except Exception as e:
+            self._failed_at = time.time()
+            print(f"Warning: result database unavailable: {e}")
+            return None
+
+    @staticmethod
+    def record(job_id: str, document: Dict, result: Dict, submitted_at: Optional[float] = None) -> Dict:
+        """
+        Rows of one finished job.
+
+        Args:
+            job_id: Job id the API serves the result under
+            document: doc_id, user_id, title, storage_path of the submission
+            result: Job result (as stored in the result backend)
+            submitted_at: Enqueue time (epoch seconds), default now
+        """
+        summary = {key: value for key, value in result.items() if key != "fragments"}
+        return {
+            "job_id": job_id,
+            "document": document,
+            "status": "error" if result.get("error") else "done",
+            "similarity": (result.get("summary") or {}).get("similarity"),
+            "ai_probability": (result.get("ai_detection") or {}).get("probability"),
+            "summary": summary,
+            "fragments": result.get("fragments") or [],
+            "submitted_at": datetime.utcfromtimestamp(submitted_at or time.time()),
+        }
+
+    def save(self, records: List[Dict]) -> bool:
+        """
+        Write the rows of finished jobs in one transaction.
+
+        Returns:
+            True when written
+        """
+        if not records:
+            return True
+        conn = self._connection()
+        if conn is None:
+            return False
+
+        from psycopg2.extras import Json, execute_values
+
+        completed_at = datetime.utcnow()
+        try:
+            with conn, conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO documents (id, user_id, title, storage_path, uploaded_at, is_reference)
+                    SELECT v.id, u.id, v.title, v.storage_path, v.uploaded_at, false
+                    FROM (VALUES %s) AS v (id, user_id, title, storage_path, uploaded_at)
+                    LEFT JOIN users u ON u.id = v.user_id
+                    ON CONFLICT (id) DO NOTHING
+                    """,
+                    [
+                        (
+                            record["document"]["doc_id"],
+                            record["document"].get("user_id"),
+                            _clip(record["document"].get("title"), TITLE_LENGTH),
+                            _clip(record["document"].get("storage_path") or "", PATH_LENGTH),
+                            record["submitted_at"],
+                        )
+                        for record in records
+                    ],
+                )
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO jobs (id, document_id, status, submitted_at, completed_at,
+                                      similarity, ai_probability, summary)
+                    VALUES %s
+                    ON CONFLICT (id) DO UPDATE SET
+                        status = EXCLUDED.status,
+                        completed_at = EXCLUDED.completed_at,
+                        similarity = EXCLUDED.similarity,
+                        ai_probability = EXCLUDED.ai_probability,
+                        summary = EXCLUDED.summary
+                    """,
+                    [
+                        (
+                            record["job_id"],
+                            record["document"]["doc_id"],
+                            record["status"],
+                            record["submitted_at"],
+                            completed_at,
+                            record["similarity"],
+                            record["ai_probability"],
+                            Json(record["summary"]),
+                        )
+                        for record in records
+                    ],
+                )
+                # Re-run jobs replace their fragments
+                cur.execute(
+                    "DELETE FROM fragments WHERE job_id = ANY(%s)",
+                    ([record["job_id"] for record in records],)
+                )
+                cur.copy_expert(
+                    "COPY fragments (id, job_id, rank, length_tokens, match_type, score, "
+                    "text, source_title, source_url, source_excerpt) FROM STDIN WITH (FORMAT csv)",
+                    _fragment_csv(records),
+                )
+            return True
+        except Exception as e:
+            print(f"Warning: result persistence failed: {e}")
+            if conn.closed:
+                self._conn = None
+            return False
+
+
+def _fragment_csv(records: List[Dict]) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        for rank, fragment in enumerate(record["fragments"]):
+            text = fragment.get("text") or ""
+            writer.writerow([
+                str(uuid.uuid4()),
+                record["job_id"],
+                rank,
+                len(text.split()),
+                MATCH_TYPE,
+                fragment.get("score", 0.0),
+                text,
+                _clip(fragment.get("source"), TITLE_LENGTH),
+                _clip(fragment.get("url"), PATH_LENGTH),
+                fragment.get("matched_text"),
+            ])
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,101 @@
+"""
+OpenTelemetry tracing for the worker.
+The API injects the W3C trace context of the /upload span into the task
+payload (`payload["trace"]`); the worker continues that trace with spans for
+queue wait, every pipeline stage and the expensive model / vectorizer calls.
+
+Spans are exported to the console or appended as JSON lines to a local file,
+so traces can be inspected offline without a collector:
+
+    OTEL_TRACES_EXPORTER=file OTEL_TRACES_FILE=/tmp/plagiarism-traces.jsonl
+
+Without opentelemetry-sdk (or with OTEL_TRACES_EXPORTER=none) every span is a
+no-op from the OpenTelemetry API.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from opentelemetry import context, propagate, trace
+
+EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none").lower()
+TRACES_FILE = os.getenv("OTEL_TRACES_FILE", "/tmp/plagiarism-traces.jsonl")
+
+tracer = trace.get_tracer("worker.pipeline")
+
+_processor = None
+
+
+def configure(service_name: str = "plagiarism-worker"):
+    """
+    Install a tracer provider with a console or file exporter.
+    Runs on the first traced task of each process, i.e. after fork: span
+    processors own a background thread that does not survive fork.
+    """
+    global _processor
+    if EXPORTER in ("", "none") or _processor is not None:
+        return
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        print("Warning: opentelemetry-sdk not installed, tracing disabled")
+        return
+
+    if EXPORTER == "file":
+        exporter = ConsoleSpanExporter(
+            out=open(TRACES_FILE, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    else:
+        exporter = ConsoleSpanExporter()
+
+    provider = TracerProvider(resource=Resource.create({
+        "service.name": service_name,
+        "process.pid": os.getpid(),
+    }))
+    _processor = BatchSpanProcessor(exporter)
+    provider.add_span_processor(_processor)
+    trace.set_tracer_provider(provider)
+
+
+def shutdown():
+    """Flush spans still buffered in this process."""
+    if _processor is not None:
+        _processor.force_flush()
+
+
+def inject() -> Dict:
+    """Trace context of the current span, plus the time it was handed off."""
+    carrier = {"sent_at": time.time()}
+    propagate.inject(carrier)
+    return carrier
+
+
+@contextmanager
+def continue_trace(name: str, carrier: Optional[Dict], **attributes):
+    """
+    Start a span as child of the context carried in a task payload.
+    Records how long the task waited since the carrier was created
+    (time in the Redis queue plus waiting for a free worker).
+    """
+    configure()
+    carrier = carrier or {}
+    token = context.attach(propagate.extract(carrier))
+    try:
+        with tracer.start_as_current_span(name, kind=trace.SpanKind.CONSUMER) as span:
+            if "sent_at" in carrier:
+                span.set_attribute("queue.wait_ms", int((time.time() - carrier["sent_at"]) * 1000))
+            for key, value in attributes.items():
+                span.set_attribute(key, value)
+            yield span
+    finally:
+        context.detach(token)
+
+
+def span(name: str, **attributes):
+    """Child span of the current span."""
+    return tracer.start_as_current_span(name, attributes=attributes or None)
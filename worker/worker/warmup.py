@@ -0,0 +1,133 @@
+"""
+Warm worker startup.
+Loads models in the Celery parent process before the prefork pool forks, so
+children share the weights copy-on-write, and pins torch/OpenMP/MKL thread
+counts per child from a core budget to avoid CPU oversubscription.
+"""
+import gc
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import torch
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+WARMUP_TEXT = (
+    "Machine learning is a subset of artificial intelligence. It is important to note "
+    "that models learn patterns from data. However, results vary between datasets!"
+)
+
+
+def threads_per_child(core_budget: int, concurrency: int) -> int:
+    """
+    Split the node's core budget evenly across pool children.
+
+    Args:
+        core_budget: Cores this worker may use in total
+        concurrency: Number of prefork children
+
+    Returns:
+        Threads each child may use (at least 1)
+    """
+    return max(1, core_budget // max(1, concurrency))
+
+
+def configure_threads(num_threads: int):
+    """
+    Pin intra-op thread pools of torch, OpenMP/MKL and BLAS.
+
+    Args:
+        num_threads: Threads this process may use
+    """
+    # Picked up by native libraries that initialize after this point
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(num_threads)
+
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Can only be set once, before any inter-op work started
+
+    # Already-initialized BLAS pools (numpy / scikit-learn)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(num_threads)
+    except ImportError:
+        pass
+
+
+def scorer_executor(num_threads: int, num_scorers: int = 4) -> Optional[ThreadPoolExecutor]:
+    """
+    Bounded thread pool for running similarity scorers concurrently.
+    Create it after fork; threads do not survive fork.
+    
+    Args:
+        num_threads: Threads this process may use (its share of the core budget)
+        num_scorers: Scorers per pair; more threads than that never help
+    
+    Returns:
+        Executor, or None when the budget leaves no room for concurrency
+    """
+    workers = min(num_scorers, num_threads)
+    if workers < 2:
+        return None
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scorer")
+
+
+def preload_models(ai_detector, detector) -> Dict[str, float]:
+    """
+    Load all models owned by this process.
+    Models served by a shared inference server are skipped.
+
+    Returns:
+        Load time in milliseconds per model
+    """
+    load_times = {}
+
+    if detector.inference_client is None:
+        start = time.perf_counter()
+        detector._load_semantic_model()
+        load_times["semantic"] = (time.perf_counter() - start) * 1000
+
+    if ai_detector.inference_client is None:
+        start = time.perf_counter()
+        ai_detector._load_roberta_model()
+        load_times["roberta"] = (time.perf_counter() - start) * 1000
+
+    if ai_detector.perplexity_scorer is not None:
+        start = time.perf_counter()
+        ai_detector.perplexity_scorer._load_model()
+        load_times["perplexity"] = (time.perf_counter() - start) * 1000
+
+    return load_times
+
+
+def warm_up(ai_detector, detector):
+    """Run one small inference through every model so lazy init happens now."""
+    detector.combined_similarity_score(WARMUP_TEXT, WARMUP_TEXT)
+    ai_detector.detect_ai_comprehensive(WARMUP_TEXT)
+
+
+def prepare_parent(ai_detector, detector) -> Dict[str, float]:
+    """
+    Preload and warm models in the parent before the pool forks.
+
+    Returns:
+        Load time in milliseconds per model
+    """
+    # Single-threaded in the parent: an OpenMP pool created before fork
+    # is not usable in the children
+    torch.set_num_threads(1)
+
+    load_times = preload_models(ai_detector, detector)
+    warm_up(ai_detector, detector)
+
+    # Move everything allocated so far out of GC tracking so collections in
+    # the children do not touch (and copy) the shared pages
+    gc.collect()
+    gc.freeze()
+
+    return load_times